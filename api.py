@@ -471,6 +471,12 @@ async def get_recent_calls_endpoint(
 # =============================================================================
 
 
+# Evaluation concurrency defaults; queries hit the LLM API, so keep them
+# under the account's rate limits
+EVALUATION_MAX_WORKERS = int(os.getenv("EVALUATION_MAX_WORKERS", "4"))
+EVALUATION_MAX_QPS = float(os.getenv("EVALUATION_MAX_QPS", "2"))
+
+
 class EvaluationRequest(BaseModel):
     """Request model for evaluation"""
     queries: List[Dict[str, Any]] = Field(
@@ -482,6 +488,17 @@ class EvaluationRequest(BaseModel):
         False, 
         description="If true, use built-in sample dataset instead of provided queries"
     )
+    max_workers: Optional[int] = Field(
+        None,
+        ge=1,
+        le=16,
+        description="Queries evaluated concurrently, 1 for sequential (default: EVALUATION_MAX_WORKERS)"
+    )
+    max_queries_per_second: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Cap on the rate queries are started at (default: EVALUATION_MAX_QPS)"
+    )
 
 
 @app.post("/evaluation/run", tags=["Evaluation"])
@@ -503,7 +520,12 @@ async def run_evaluation(
     
     try:
         openai_api_key = os.getenv("OPENAI_API_KEY")
-        evaluator = QueryEvaluator(rag_instance=rag_instance, openai_api_key=openai_api_key)
+        evaluator = QueryEvaluator(
+            rag_instance=rag_instance,
+            openai_api_key=openai_api_key,
+            max_workers=request.max_workers or EVALUATION_MAX_WORKERS,
+            max_queries_per_second=request.max_queries_per_second or EVALUATION_MAX_QPS
+        )
         
         # Use sample dataset if requested
         if request.use_sample_dataset:
@@ -512,7 +534,7 @@ async def run_evaluation(
             queries = request.queries
         
         # Run evaluation
-        summary = evaluator.evaluate_batch(queries, use_llm=request.use_llm)
+        summary = await evaluator.evaluate_batch_async(queries, use_llm=request.use_llm)
         
         # Convert to dict for JSON serialization
         result = {
@@ -520,6 +542,7 @@ async def run_evaluation(
                 "total_queries": summary.total_queries,
                 "successful_queries": summary.successful_queries,
                 "failed_queries": summary.failed_queries,
+                "wall_time_ms": round(summary.wall_time_ms, 2),
                 "avg_latency_ms": round(summary.avg_latency_ms, 2),
                 "p50_latency_ms": round(summary.p50_latency_ms, 2),
                 "p95_latency_ms": round(summary.p95_latency_ms, 2),
@@ -12,6 +12,14 @@ from neo4j import GraphDatabase
 # Load environment variables
 load_dotenv()
 
+# TechCrunch Disrupt nodes by upper-cased name (bound as `upper_name`)
+TECHCRUNCH_DISRUPT_PREDICATE = """
+    upper_name CONTAINS 'DISRUPT'
+    AND (upper_name CONTAINS 'TECHCRUNCH'
+         OR upper_name CONTAINS '2025'
+         OR upper_name CONTAINS '2024')
+"""
+
 
 def delete_techcrunch_disrupt_nodes():
     """Delete all TechCrunch Disrupt related nodes from the graph"""
@@ -33,13 +41,10 @@ def delete_techcrunch_disrupt_nodes():
             # First, find all TechCrunch Disrupt nodes
             print("\n🔍 Finding TechCrunch Disrupt nodes...")
             result = session.run(
-                """
+                f"""
                 MATCH (n)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*TECHCRUNCH.*'
-                            OR n.name =~ '(?i).*2025.*'
-                            OR n.name =~ '(?i).*2024.*'))
+                WITH n, toUpper(n.name) AS upper_name
+                WHERE {TECHCRUNCH_DISRUPT_PREDICATE}
                 RETURN labels(n) as type, n.name as name, id(n) as internal_id
                 ORDER BY n.name
             """
@@ -55,52 +60,31 @@ def delete_techcrunch_disrupt_nodes():
             for record in nodes_to_delete:
                 print(f"  - {record['name']} (type: {', '.join(record['type'])})")
 
-            # Delete relationships first
-            print("\n🗑️  Deleting relationships...")
-            rel_result = session.run(
-                """
-                MATCH (n)-[r]-(related)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*TECHCRUNCH.*'
-                            OR n.name =~ '(?i).*2025.*'
-                            OR n.name =~ '(?i).*2024.*'))
-                DELETE r
-                RETURN count(r) as deleted
-            """
-            )
-            rel_record = rel_result.single()
-            rel_count = rel_record["deleted"] if rel_record else 0
-            print(f"✓ Deleted {rel_count} relationship(s)")
-
-            # Delete nodes
-            print("\n🗑️  Deleting nodes...")
-            node_result = session.run(
-                """
+            # Delete nodes together with their relationships
+            print("\n🗑️  Deleting nodes and relationships...")
+            delete_result = session.run(
+                f"""
                 MATCH (n)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*TECHCRUNCH.*'
-                            OR n.name =~ '(?i).*2025.*'
-                            OR n.name =~ '(?i).*2024.*'))
-                DELETE n
-                RETURN count(n) as deleted
+                WITH n, toUpper(n.name) AS upper_name
+                WHERE {TECHCRUNCH_DISRUPT_PREDICATE}
+                WITH n, COUNT {{ (n)--() }} AS rel_count
+                DETACH DELETE n
+                RETURN count(n) as nodes, sum(rel_count) as relationships
             """
             )
-            node_record = node_result.single()
-            node_count = node_record["deleted"] if node_record else 0
+            delete_record = delete_result.single()
+            rel_count = delete_record["relationships"] if delete_record else 0
+            node_count = delete_record["nodes"] if delete_record else 0
+            print(f"✓ Deleted {rel_count} relationship(s)")
             print(f"✓ Deleted {node_count} node(s)")
 
             # Verify deletion
             print("\n🔍 Verifying deletion...")
             verify_result = session.run(
-                """
+                f"""
                 MATCH (n)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*TECHCRUNCH.*'
-                            OR n.name =~ '(?i).*2025.*'
-                            OR n.name =~ '(?i).*2024.*'))
+                WITH n, toUpper(n.name) AS upper_name
+                WHERE {TECHCRUNCH_DISRUPT_PREDICATE}
                 RETURN count(n) as remaining
             """
             )
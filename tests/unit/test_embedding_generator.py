@@ -0,0 +1,145 @@
+"""
+Unit tests for embedding generation helpers
+Tests the background writer, thread setup and vector index checks without Neo4j
+"""
+
+import threading
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils import embedding_generator
+from utils.embedding_generator import (
+    VECTOR_INDEX_LABELS,
+    EmbeddingGenerator,
+    _BackgroundWriter,
+    _configure_threads_once,
+)
+
+
+def make_row(entity_id, dim=4):
+    """Row shaped like the output of EmbeddingGenerator._embed_page"""
+    return {"id": entity_id, "vector": {"embedding_dim": dim}}
+
+
+def make_generator(write):
+    """Stub generator whose driver hands out dummy sessions"""
+    generator = MagicMock()
+    generator.driver.session.side_effect = lambda: nullcontext(object())
+    generator._write_embeddings.side_effect = write
+    return generator
+
+
+def run_with_timeout(target, timeout=5.0):
+    """Run `target` on a thread, failing the test if it does not finish"""
+    outcome = {}
+
+    def runner():
+        try:
+            target()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "producer blocked"
+    return outcome.get("error")
+
+
+class TestBackgroundWriter:
+    """Test the embedding writer thread"""
+
+    def test_writes_all_batches(self):
+        """Test every submitted batch is written and counted"""
+        generator = make_generator(lambda session, rows, label: len(rows))
+
+        with _BackgroundWriter(generator) as writer:
+            for _ in range(5):
+                writer.submit([make_row("a"), make_row("b")])
+            writer.submit([])
+
+        assert writer.written == 10
+        assert writer.dimensions == 4
+        assert generator._write_embeddings.call_count == 5
+
+    def test_write_error_reaches_caller(self):
+        """Test a failing write is raised on the caller instead of hanging"""
+
+        def write(session, rows, label):
+            raise RuntimeError("transient error")
+
+        generator = make_generator(write)
+
+        def produce():
+            with _BackgroundWriter(generator) as writer:
+                for _ in range(10):
+                    writer.submit([make_row("a")])
+
+        error = run_with_timeout(produce)
+        assert isinstance(error, RuntimeError)
+        assert str(error) == "transient error"
+
+    def test_producer_error_takes_precedence(self):
+        """Test the caller's own exception is not replaced by a write error"""
+
+        def write(session, rows, label):
+            raise RuntimeError("write failed")
+
+        generator = make_generator(write)
+
+        with pytest.raises(ValueError):
+            with _BackgroundWriter(generator) as writer:
+                writer.submit([make_row("a")])
+                raise ValueError("encoding failed")
+
+
+class TestConfigureThreadsOnce:
+    """Test torch thread pools are sized once per process"""
+
+    def test_configures_once(self, monkeypatch, capsys):
+        """Test concurrent generators configure and log the threads once"""
+        monkeypatch.setattr(embedding_generator, "_torch_threads", None)
+        configure = MagicMock(return_value=6)
+
+        threads = [
+            threading.Thread(target=_configure_threads_once, args=(configure,))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert configure.call_count == 1
+        assert _configure_threads_once(configure) == 6
+        assert capsys.readouterr().out.count("Using 6 CPU threads") == 1
+
+
+class TestVectorIndexesOnline:
+    """Test vector indexes are only used once fully built"""
+
+    def make_generator(self, online):
+        generator = MagicMock()
+        session = MagicMock()
+        session.run.return_value.single.return_value = {"online": online}
+        generator.driver.session.return_value = nullcontext(session)
+        return generator, session
+
+    def test_all_online(self):
+        """Test indexes are usable when every label's index is ONLINE"""
+        generator, session = self.make_generator(len(VECTOR_INDEX_LABELS))
+        assert EmbeddingGenerator._vector_indexes_online(generator)
+        assert "CREATE" not in session.run.call_args.args[0]
+
+    def test_some_populating(self):
+        """Test indexes are skipped while any of them is still populating"""
+        generator, _ = self.make_generator(len(VECTOR_INDEX_LABELS) - 1)
+        assert not EmbeddingGenerator._vector_indexes_online(generator)
+
+    def test_check_failure(self):
+        """Test a failing check falls back to in-memory search"""
+        generator = MagicMock()
+        generator.driver.session.side_effect = RuntimeError("unsupported")
+        assert not EmbeddingGenerator._vector_indexes_online(generator)
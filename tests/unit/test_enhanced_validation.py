@@ -0,0 +1,156 @@
+"""
+Unit tests for enhanced validation utilities
+Tests funding amount, date and entity name validation
+"""
+
+import pytest
+
+from utils.enhanced_validation import (
+    validate_date_format,
+    validate_entity_name_format,
+    validate_extraction_enhanced,
+    validate_funding_amount,
+)
+
+
+class TestFundingAmountValidation:
+    """Test funding amount parsing and normalization"""
+
+    @pytest.mark.parametrize(
+        "amount,expected",
+        [
+            ("$50M", "$50.00M"),
+            ("$50 million", "$50.00M"),
+            ("$1.5B", "$1500.00M"),
+            ("$2,500K", "$2.50M"),
+            ("75M USD", "$75.00M"),
+        ],
+    )
+    def test_valid_amounts(self, amount, expected):
+        """Test amounts are normalized to millions"""
+        assert validate_funding_amount(amount) == (True, expected)
+
+    def test_bare_number_read_as_millions(self):
+        """Test amounts without a unit are taken to be in millions"""
+        assert validate_funding_amount("$50") == (True, "$50.00M")
+        assert validate_funding_amount("$50,000,000")[0] is False
+
+    def test_empty_amount(self):
+        """Test empty amounts are rejected"""
+        assert validate_funding_amount("") == (False, "Funding amount is empty")
+
+    def test_amount_out_of_range(self):
+        """Test amounts below $1M are rejected"""
+        is_valid, error = validate_funding_amount("$500K")
+        assert is_valid is False
+        assert "too small" in error
+
+    def test_unparseable_amount(self):
+        """Test amounts without a number are rejected"""
+        is_valid, error = validate_funding_amount("undisclosed")
+        assert is_valid is False
+        assert "Could not parse" in error
+
+
+class TestDateValidation:
+    """Test date validation and normalization"""
+
+    @pytest.mark.parametrize(
+        "date_str",
+        [
+            "2024-01-15",
+            "2024-01-15T10:30:00",
+            "2024-01-15T10:30:00+02:00",
+            "2024-01-15T10:30:00Z",
+        ],
+    )
+    def test_valid_iso_dates(self, date_str):
+        """Test ISO dates are accepted unchanged"""
+        assert validate_date_format(date_str) == (True, date_str)
+
+    @pytest.mark.parametrize("date_str", ["2024-02-30", "2024-13-01", "2024-00-10"])
+    def test_invalid_iso_dates(self, date_str):
+        """Test impossible calendar dates are rejected"""
+        is_valid, error = validate_date_format(date_str)
+        assert is_valid is False
+        assert "Invalid date format" in error
+
+    def test_date_range(self):
+        """Test dates outside 1990-2100 are rejected"""
+        assert validate_date_format("1989-12-31")[0] is False
+        assert validate_date_format("2101-01-01")[0] is False
+
+    def test_non_iso_rejected_in_iso_mode(self):
+        """Test other formats fail when ISO is required"""
+        is_valid, error = validate_date_format("01/15/2024")
+        assert is_valid is False
+        assert "not in ISO format" in error
+
+    @pytest.mark.parametrize(
+        "date_str,expected",
+        [
+            ("2024-1-5", "2024-01-05"),
+            ("01/15/2024", "2024-01-15"),
+            ("15/01/2024", "2024-01-15"),
+            ("1/2/2024", "2024-01-02"),
+            ("January 15, 2024", "2024-01-15"),
+        ],
+    )
+    def test_common_formats_normalized(self, date_str, expected):
+        """Test common formats are normalized to ISO"""
+        assert validate_date_format(date_str, "any") == (True, expected)
+
+    def test_unparseable_date(self):
+        """Test unknown formats are rejected"""
+        is_valid, error = validate_date_format("15.01.2024", "any")
+        assert is_valid is False
+        assert "Could not parse" in error
+
+
+class TestEntityNameValidation:
+    """Test entity name format checks"""
+
+    @pytest.mark.parametrize(
+        "name", ["OpenAI", "IBM", "O'Reilly Media", "Y Combinator"]
+    )
+    def test_valid_names(self, name):
+        """Test well-formed names are accepted"""
+        assert validate_entity_name_format(name) == (True, None)
+
+    def test_lowercase_start(self):
+        """Test names must start with a capital letter"""
+        assert validate_entity_name_format("openAI")[0] is False
+
+    def test_length_limits(self):
+        """Test too short and too long names are rejected"""
+        assert validate_entity_name_format("A")[0] is False
+        assert validate_entity_name_format("A" * 201)[0] is False
+
+    @pytest.mark.parametrize("name", ["Acme, Inc", "Café Labs", "Foo_Bar"])
+    def test_invalid_characters(self, name):
+        """Test names with unsupported characters are rejected"""
+        is_valid, error = validate_entity_name_format(name)
+        assert is_valid is False
+        assert "invalid characters" in error
+
+
+class TestExtractionValidation:
+    """Test whole-extraction validation"""
+
+    def test_valid_extraction(self):
+        """Test a clean extraction passes"""
+        extraction = {
+            "entities": [{"name": "OpenAI"}, {"name": "Microsoft"}],
+            "relationships": [{"amount": "$10B", "date": "2023-01-23"}],
+        }
+        assert validate_extraction_enhanced(extraction) == (True, [])
+
+    def test_collects_errors(self):
+        """Test errors from entities and relationships are reported"""
+        extraction = {
+            "entities": [{"name": "openai"}],
+            "relationships": [{"amount": "$100B", "date": "yesterday"}],
+        }
+        is_valid, errors = validate_extraction_enhanced(extraction)
+        assert is_valid is False
+        assert len(errors) == 3
@@ -0,0 +1,103 @@
+"""
+Unit tests for entity name normalization
+Tests suffix stripping, cleanup and similarity helpers
+"""
+
+import pytest
+
+from utils.entity_normalization import (
+    are_similar_entities,
+    find_duplicates,
+    get_canonical_name,
+    normalize_entity_name,
+)
+
+
+class TestNormalizeEntityName:
+    """Test entity name normalization"""
+
+    def test_empty_name(self):
+        """Test empty names normalize to empty string"""
+        assert normalize_entity_name("") == ""
+        assert normalize_entity_name(None) == ""
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("Acme Inc.", "ACME"),
+            ("Acme, Inc", "ACME"),
+            ("Acme LLC", "ACME"),
+            ("Acme Company", "ACME"),
+            ("Acme co.", "ACME"),
+            ("Siemens AG", "SIEMENS"),
+            ("Foo GmbH", "FOO"),
+        ],
+    )
+    def test_strips_corporate_suffix(self, name, expected):
+        """Test common corporate suffixes are removed"""
+        assert normalize_entity_name(name) == expected
+
+    def test_strips_suffix_chain(self):
+        """Test stacked suffixes are removed when later suffixes come first"""
+        assert normalize_entity_name("Acme Co Inc") == "ACME"
+        assert normalize_entity_name("Acme Company Inc.") == "ACME"
+
+    def test_suffix_chain_order(self):
+        """Test a suffix preceding a later-listed one is kept"""
+        assert normalize_entity_name("Acme Inc Co") == "ACME INC"
+
+    def test_suffix_must_be_separate_word(self):
+        """Test suffix letters inside a word are kept"""
+        assert normalize_entity_name("Disco") == "DISCO"
+        assert normalize_entity_name("Zinc") == "ZINC"
+
+    def test_removes_special_characters_and_whitespace(self):
+        """Test punctuation is dropped and whitespace collapsed"""
+        assert normalize_entity_name("  Open  AI!  ") == "OPEN AI"
+        assert normalize_entity_name("Coca-Cola") == "COCA-COLA"
+
+
+class TestSimilarEntities:
+    """Test duplicate detection helpers"""
+
+    def test_same_after_normalization(self):
+        """Test names equal after normalization are similar"""
+        assert are_similar_entities("Stripe Inc.", "STRIPE")
+
+    def test_dissimilar_names(self):
+        """Test unrelated names are not similar"""
+        assert not are_similar_entities("Stripe", "Anthropic")
+
+    def test_find_duplicates_matches_pairwise(self):
+        """Test bulk duplicate search agrees with pairwise comparison"""
+        names = ["OpenAI", "Open AI Inc.", "OpenAl", "Stripe", "Stripes", "X", ""]
+        found = {(i, j) for i, j, _ in find_duplicates(names)}
+        expected = {
+            (i, j)
+            for i in range(len(names))
+            for j in range(i + 1, len(names))
+            if are_similar_entities(names[i], names[j])
+        }
+        assert found == expected
+        assert (0, 1) in found
+
+    def test_zero_threshold_matches_everything(self):
+        """Test a threshold of 0 accepts even completely different names"""
+        assert are_similar_entities("ab", "cd", 0.0)
+        assert {(i, j) for i, j, _ in find_duplicates(["ab", "cd", "ef"], 0.0)} == {
+            (0, 1),
+            (0, 2),
+            (1, 2),
+        }
+
+    def test_find_duplicates_similarity(self):
+        """Test exact normalized matches score 1.0"""
+        assert find_duplicates(["Acme Inc", "ACME"]) == [(0, 1, 1.0)]
+
+    def test_canonical_name_prefers_most_common(self):
+        """Test canonical name is the most frequent variant"""
+        assert get_canonical_name(["OpenAI", "OpenAI", "Open AI Inc"]) == "OpenAI"
+
+    def test_canonical_name_empty(self):
+        """Test canonical name of an empty list"""
+        assert get_canonical_name([]) == ""
@@ -0,0 +1,98 @@
+"""
+Unit tests for entity resolution
+Tests duplicate grouping, merge planning and id index setup without Neo4j
+"""
+
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+from utils.entity_resolver import EntityResolver, _group_duplicates
+
+
+class TestGroupDuplicates:
+    """Test grouping duplicate pairs into connected components"""
+
+    def test_transitive_pairs_form_one_group(self):
+        """Test A~B and B~C end up in a single group"""
+        groups = _group_duplicates([("a", "b", 0.9), ("b", "c", 0.9)])
+        assert groups == [["a", "b", "c"]]
+
+    def test_separate_groups(self):
+        """Test unrelated pairs stay in separate groups"""
+        groups = _group_duplicates([("a", "b", 0.9), ("c", "d", 0.9)])
+        assert sorted(sorted(group) for group in groups) == [["a", "b"], ["c", "d"]]
+
+    def test_no_duplicates(self):
+        """Test no pairs give no groups"""
+        assert _group_duplicates([]) == []
+
+
+class TestPlanMerges:
+    """Test choosing survivors for duplicate groups"""
+
+    def test_canonical_name_survives(self):
+        """Test the most common name's entity survives and labels are kept"""
+        merges = EntityResolver._plan_merges(
+            [["a", "b", "c"]],
+            {"a": "Open AI", "b": "OpenAI", "c": "OpenAI"},
+            {"a": "Company", "b": "Company"},
+        )
+        assert merges == [
+            ("b", "a", "Company", "Company"),
+            ("b", "c", "Company", None),
+        ]
+
+
+class TestEnsureIdIndexes:
+    """Test id indexes are only created for labels being merged"""
+
+    def make_resolver(self, indexed):
+        session = MagicMock()
+        session.run.side_effect = lambda query, **params: (
+            [{"labelsOrTypes": indexed}] if "SHOW INDEXES" in query else MagicMock()
+        )
+        driver = MagicMock()
+        driver.session.return_value = nullcontext(session)
+        return EntityResolver(driver), session
+
+    def created(self, session):
+        return [
+            call.args[0]
+            for call in session.run.call_args_list
+            if call.args[0].startswith("CREATE INDEX")
+        ]
+
+    def test_only_unindexed_merge_labels(self):
+        """Test indexes are created for unindexed merge labels only"""
+        resolver, session = self.make_resolver(["Company"])
+        resolver._ensure_id_indexes({"Company", "Startup"})
+
+        created = self.created(session)
+        assert len(created) == 1
+        assert "`Startup`" in created[0]
+        assert not any(
+            "db.labels" in call.args[0] for call in session.run.call_args_list
+        )
+
+    def test_no_labels(self):
+        """Test nothing is queried when no merges are planned"""
+        resolver, session = self.make_resolver([])
+        resolver._ensure_id_indexes(set())
+        session.run.assert_not_called()
+
+
+class TestMergeErrors:
+    """Test merge failures are logged rather than printed"""
+
+    def test_failed_merge_logged(self, caplog, capsys):
+        """Test a failing pair merge returns False and logs a warning"""
+        session = MagicMock()
+        session.execute_write.side_effect = RuntimeError("deadlock")
+        driver = MagicMock()
+        driver.session.return_value = nullcontext(session)
+
+        with caplog.at_level("WARNING", logger="utils.entity_resolver"):
+            assert not EntityResolver(driver).merge_entities("a", "b")
+
+        assert "Error merging entities a and b: deadlock" in caplog.text
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,62 @@
+"""
+Unit tests for TechCrunch/Disrupt entity filtering
+Tests name matching and entity/relationship filtering
+"""
+
+import pytest
+
+from utils.filter_techcrunch import (
+    filter_techcrunch_entities,
+    filter_techcrunch_relationship,
+    is_techcrunch_related,
+)
+
+
+class TestIsTechCrunchRelated:
+    """Test TechCrunch/Disrupt name matching"""
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "TechCrunch",
+            "techcrunch disrupt 2024",
+            "TechCrunch+",
+            "Startup Battlefield",
+            "Battlefield 200",
+            "Disrupt 2023",
+            "Disrupt Startup Stage",
+            "Disrupt Conference",
+        ],
+    )
+    def test_related_names(self, name):
+        """Test TechCrunch, Battlefield and Disrupt event names are matched"""
+        assert is_techcrunch_related(name)
+
+    @pytest.mark.parametrize(
+        "name", ["", None, "OpenAI", "Disrupt Technology", "Tech Crunch Labs"]
+    )
+    def test_unrelated_names(self, name):
+        """Test other names, including a standalone 'Disrupt', are kept"""
+        assert not is_techcrunch_related(name)
+
+
+class TestFiltering:
+    """Test entity and relationship filtering"""
+
+    def test_filter_entities(self):
+        """Test related entities are removed and their names reported"""
+        entities = [{"name": "TechCrunch"}, {"name": "OpenAI"}, {}]
+        filtered, names = filter_techcrunch_entities(entities)
+        assert filtered == [{"name": "OpenAI"}, {}]
+        assert names == ["TechCrunch"]
+
+    def test_filter_relationship(self):
+        """Test relationships touching a related entity are filtered"""
+        should_filter, reason = filter_techcrunch_relationship(
+            {"source": "OpenAI", "target": "TechCrunch Disrupt"}
+        )
+        assert should_filter
+        assert "OpenAI -> TechCrunch Disrupt" in reason
+        assert filter_techcrunch_relationship(
+            {"source": "OpenAI", "target": "Microsoft"}
+        ) == (False, "")
@@ -3,176 +3,735 @@ Embedding Generation for Knowledge Graph
 Generate vector embeddings for entities and enable semantic search
 """
 
+import contextlib
+import hashlib
 import os as _os
-from typing import Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from neo4j import GraphDatabase
 
+try:
+    import faiss
+except ImportError:  # pragma: no cover - optional ANN backend
+    faiss = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional JIT backend
+    numba = None
+
 # Avoid Hugging Face tokenizers parallelism warning after fork
 _os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
 
+# Quantized export loaded when EMBEDDING_BACKEND=onnx (AVX-512 VNNI INT8 kernels)
+DEFAULT_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def export_quantized_onnx_model(
+    model_name: str, output_dir: str, quantization_config: str = "avx512_vnni"
+) -> str:
+    """
+    Export a SentenceTransformer to ONNX with dynamic INT8 quantization
+
+    Intended as a one-off preload step; point SENTENCE_TRANSFORMERS_MODEL at
+    `output_dir` and set EMBEDDING_BACKEND=onnx to serve the result.
+
+    Args:
+        model_name: Hugging Face model id or local path
+        output_dir: Directory the ONNX model is saved to
+        quantization_config: "arm64", "avx2", "avx512" or "avx512_vnni"
+
+    Returns:
+        The output directory
+    """
+    from sentence_transformers import (
+        SentenceTransformer,
+        export_dynamic_quantized_onnx_model,
+    )
+
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save_pretrained(output_dir)
+    export_dynamic_quantized_onnx_model(model, quantization_config, output_dir)
+    return output_dir
+
+
+# Supported EMBEDDING_STORAGE formats and the node property holding the vector
+STORAGE_PROPERTIES = {
+    "float32": "embedding",  # list of floats
+    "float16": "embedding_fp16",  # IEEE half-precision bytes
+    "int8": "embedding_q",  # int8 bytes plus per-vector embedding_scale
+}
+# Every vector property written by any format (cleared when switching formats)
+_VECTOR_PROPERTIES = ("embedding", "embedding_fp16", "embedding_q", "embedding_scale")
+
+
+# Entity node labels (see TechCrunchGraphBuilder._get_node_label); Neo4j vector
+# indexes are single-label, so each gets its own index
+VECTOR_INDEX_LABELS = (
+    "Company",
+    "Person",
+    "Investor",
+    "Technology",
+    "Product",
+    "FundingRound",
+    "Location",
+    "Event",
+    "Entity",
+)
+
+
+# Encoder models shared by all EmbeddingGenerator instances in the process
+_MODEL_CACHE: Dict[Tuple, object] = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def _shared_model(key: Tuple, load: Callable[[], object]):
+    """
+    Return the model cached under `key`, loading it at most once per process
+
+    Double-checked locking keeps cache hits lock-free, while concurrent
+    first loads (e.g. the API and a pipeline run constructing generators at
+    the same time) wait for a single load instead of each holding a copy.
+    """
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                model = _MODEL_CACHE[key] = load()
+    return model
+
+
+# Torch's thread pools are process-wide, so they are sized once per process;
+# None until the first generator has configured them
+_THREADS_LOCK = threading.Lock()
+_torch_threads: Optional[int] = None
+
+
+def _configure_threads_once(configure: Callable[[], int]) -> int:
+    """Run `configure` on the first call only; return the thread count it chose"""
+    global _torch_threads
+    with _THREADS_LOCK:
+        if _torch_threads is None:
+            _torch_threads = configure()
+            print(f"✓ Using {_torch_threads} CPU threads for encoder inference")
+        return _torch_threads
+
+
+def _vector_index_name(label: str) -> str:
+    return f"entity_embedding_{label.lower()}"
+
+
+# Columns the bulk-embedding queries return as embedding text input
+_ENTITY_TEXT_FIELDS = (
+    "name",
+    "type",
+    "description",
+    "enriched_description",
+    "headquarters",
+    "founded_year",
+    "founders",
+    "products",
+    "technologies",
+    "funding_total",
+    "funding_stage",
+)
+
+
+def _entity_fields_reader(keys: Sequence[str]) -> Callable[[Sequence], Dict]:
+    """
+    Build a reader that turns result records into entity dictionaries
+
+    Column positions are resolved once per result, so each record is read
+    with a single positional itemgetter call instead of per-key lookups.
+
+    Args:
+        keys: Column names of the query result
+
+    Returns:
+        Function mapping a record to a dict of the _ENTITY_TEXT_FIELDS
+    """
+    keys = list(keys)
+    getter = itemgetter(*(keys.index(field) for field in _ENTITY_TEXT_FIELDS))
+    return lambda record: dict(zip(_ENTITY_TEXT_FIELDS, getter(record)))
+
+
+# Entity keys that _build_company_text handles explicitly or never embeds
+_COMPANY_TEXT_SKIP_KEYS = frozenset(
+    {
+        "id",
+        "name",
+        "type",
+        "description",
+        "enriched_description",
+        "headquarters",
+        "founded_year",
+        "founders",
+        "products",
+        "technologies",
+        "funding_total",
+        "funding_stage",  # Handled with funding_total
+        "employee_count",
+        "pricing_model",
+        "website_url",  # Skip URL in embedding text
+        "enrichment_status",  # Metadata, skip
+        "enrichment_timestamp",  # Metadata, skip
+        "enrichment_confidence",  # Metadata, skip
+    }
+)
+
+
+@lru_cache(maxsize=None)
+def _field_title(key: str) -> str:
+    """Human-readable label for a dynamic enrichment property"""
+    return key.replace("_", " ").title()
+
+
+def quantize_int8(vector) -> Tuple[bytes, float]:
+    """
+    Symmetric per-vector int8 quantization
+
+    Returns:
+        (int8 bytes, scale) such that vector ~= int8 values * scale
+    """
+    values = np.asarray(vector, dtype=np.float32)
+    scale = float(np.abs(values).max()) / 127.0 if values.size else 0.0
+    if scale == 0.0:
+        return np.zeros(values.shape, dtype=np.int8).tobytes(), 1.0
+    return np.round(values / scale).astype(np.int8).tobytes(), scale
+
+
+def dequantize_int8(data: bytes, scale: float) -> np.ndarray:
+    """Inverse of quantize_int8, returning a float32 vector"""
+    return np.frombuffer(data, dtype=np.int8).astype(np.float32) * np.float32(scale)
+
+
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _topk_dot_kernel(matrix, query, k, n_chunks):  # pragma: no cover - JIT
+        """
+        Fused dot product + per-chunk top-k over unit-norm rows
+
+        Each parallel chunk keeps its own descending top-k by insertion, so no
+        N-length score array is materialized. Returns the k * n_chunks
+        candidates (index -1 marks unused slots).
+        """
+        n, dim = matrix.shape
+        chunk = (n + n_chunks - 1) // n_chunks
+        best_scores = np.full((n_chunks, k), -np.inf, dtype=np.float32)
+        best_index = np.full((n_chunks, k), -1, dtype=np.int64)
+        for c in numba.prange(n_chunks):
+            for i in range(c * chunk, min((c + 1) * chunk, n)):
+                score = np.float32(0.0)
+                for j in range(dim):
+                    score += matrix[i, j] * query[j]
+                if score > best_scores[c, k - 1]:
+                    pos = k - 1
+                    while pos > 0 and best_scores[c, pos - 1] < score:
+                        best_scores[c, pos] = best_scores[c, pos - 1]
+                        best_index[c, pos] = best_index[c, pos - 1]
+                        pos -= 1
+                    best_scores[c, pos] = score
+                    best_index[c, pos] = i
+        return best_scores.ravel(), best_index.ravel()
+
+
+def _topk_dot(
+    matrix: np.ndarray, query: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k rows of `matrix` by dot product with `query` using the Numba kernel
+
+    Returns:
+        (indices, scores) sorted by descending score
+    """
+    scores, indices = _topk_dot_kernel(
+        matrix, query.astype(np.float32, copy=False), k, numba.get_num_threads() * 4
+    )
+    valid = indices >= 0
+    scores, indices = scores[valid], indices[valid]
+    order = np.argsort(-scores)[:k]
+    return indices[order], scores[order]
+
+
+@dataclass
+class _Corpus:
+    """In-memory similarity corpus: row-normalized embeddings plus entity metadata"""
+
+    dim: int
+    matrix: np.ndarray
+    entities: List[Dict]
+    loaded_at: float
+    ann_index: Optional[object] = None
+
+
+class _BackgroundWriter:
+    """
+    Persist embedding batches on a worker thread
+
+    Lets the caller encode the next page while the previous one is written,
+    overlapping model inference with Neo4j I/O. The queue is bounded, so at
+    most `depth` encoded pages wait in memory. The worker uses its own
+    session because driver sessions are not thread-safe.
+
+    If a write raises, the worker keeps draining the queue so the caller
+    never blocks, and the error is re-raised on the caller's thread by the
+    next submit() or on leaving the `with` block.
+    """
+
+    def __init__(self, generator, label: Optional[str] = None, depth: int = 2):
+        self.generator = generator
+        self.label = label
+        self.written = 0
+        # Embedding dimension of the submitted rows, once any were submitted
+        self.dimensions: Optional[int] = None
+        self._error: Optional[Exception] = None
+        self._queue: "queue.Queue[Optional[List[Dict]]]" = queue.Queue(depth)
+        self._thread = threading.Thread(
+            target=self._run, name="embedding-writer", daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        # Drain pending batches even when the producer failed
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None and exc_info[0] is None:
+            raise self._error
+        return False
+
+    def submit(self, rows: List[Dict]):
+        """Queue a batch of rows, blocking while `depth` batches are pending"""
+        if self._error is not None:
+            raise self._error
+        if rows:
+            self.dimensions = rows[0]["vector"]["embedding_dim"]
+            self._queue.put(rows)
+
+    def _run(self):
+        try:
+            with self.generator.driver.session() as session:
+                while True:
+                    rows = self._queue.get()
+                    if rows is None:
+                        return
+                    self.written += self.generator._write_embeddings(
+                        session, rows, self.label
+                    )
+        except Exception as e:
+            self._error = e
+            # Keep consuming until the end marker so submit() never blocks
+            while self._queue.get() is not None:
+                pass
+
+
 class EmbeddingGenerator:
     """Generate embeddings for entities"""
 
+    # Records pulled per Bolt fetch while streaming entities for bulk encoding
+    READ_FETCH_SIZE = 1000
+    # Rows persisted per UNWIND write statement
+    WRITE_BATCH_SIZE = int(_os.getenv("EMBEDDING_WRITE_BATCH_SIZE", "500"))
+    # Query embeddings kept in the LRU cache used by find_similar_entities
+    QUERY_CACHE_SIZE = 1024
+    # Repeated texts whose embeddings a bulk run remembers across pages, kept
+    # as float32 arrays (~1.5 KB each at 384 dimensions)
+    RUN_MEMO_SIZE = 1024
+    # Corpus size from which a FAISS HNSW index replaces the brute-force scan
+    ANN_MIN_CORPUS_SIZE = int(_os.getenv("EMBEDDING_ANN_MIN_ENTITIES", "50000"))
+    # Corpus size from which the Numba top-k kernel replaces GEMV + argpartition
+    JIT_MIN_CORPUS_SIZE = int(_os.getenv("EMBEDDING_JIT_MIN_ENTITIES", "10000"))
+    # Initial row capacity of the resident similarity matrix
+    CORPUS_INITIAL_ROWS = 1024
+    # HNSW graph degree (M) and build-time candidate list size
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 200
+
     def __init__(
         self,
         driver: GraphDatabase,
         embedding_model: str = "openai",
         sentence_model_name: Optional[str] = None,
+        corpus_max_age_seconds: Optional[float] = None,
     ):
         self.driver = driver
         self.embedding_model = embedding_model
         self.sentence_model_name = sentence_model_name
+        # Resolved encoder model and ONNX file, set when the model is loaded
+        self.model_name: Optional[str] = None
+        self.onnx_file: Optional[str] = None
         self.embedding_function = None
+        self.embed_batch_function = None
+        self.backend = "torch"
+        self.device = "cpu"
+        self.batch_size = 32
+        self.torch_threads: Optional[int] = None
+        self.precision = "fp32"
+        self.storage = _os.getenv("EMBEDDING_STORAGE", "float32").lower()
+        if self.storage not in STORAGE_PROPERTIES:
+            print(f"⚠️  Unknown EMBEDDING_STORAGE '{self.storage}', using float32")
+            self.storage = "float32"
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
+        # Resident similarity corpus, loaded lazily by find_similar_entities
+        self.corpus_max_age_seconds = (
+            corpus_max_age_seconds
+            if corpus_max_age_seconds is not None
+            else float(_os.getenv("EMBEDDING_CORPUS_MAX_AGE", "300"))
+        )
+        self._corpus: Optional[_Corpus] = None
+        self._corpus_lock = threading.Lock()
+
+        # Native vector index state; retried after failures once the delay passes
+        self._vector_index_ready = False
+        self._vector_index_retry_at = 0.0
+        # Earliest time to retry the GDS server-side scan after it failed
+        self._server_scan_retry_at = 0.0
 
         # Initialize embedding function based on model
         self._initialize_embedding_function()
 
     def _initialize_embedding_function(self):
         """Initialize embedding function based on model"""
-        # Force sentence-transformers for embeddings
+        if self.embedding_model == "model2vec":
+            self._initialize_model2vec()
+            return
+
+        # Otherwise force sentence-transformers for embeddings
         try:
             import os as _os
 
+            self.torch_threads = _configure_threads_once(self._configure_threads)
+
             from sentence_transformers import SentenceTransformer
 
             model_name = self.sentence_model_name or _os.getenv(
                 "SENTENCE_TRANSFORMERS_MODEL", "all-MiniLM-L6-v2"
             )
-            model = SentenceTransformer(model_name)
+            self.device = self._select_device()
+            self.batch_size = int(
+                _os.getenv("ST_BATCH_SIZE") or (32 if self.device == "cpu" else 128)
+            )
+            backend = _os.getenv("EMBEDDING_BACKEND", "torch").lower()
+            onnx_file = _os.getenv("EMBEDDING_ONNX_FILE", DEFAULT_ONNX_FILE)
+            self.model_name = model_name
+            self.onnx_file = onnx_file
+            model, self.backend = _shared_model(
+                ("sentence-transformers", model_name, self.device, backend, onnx_file),
+                lambda: self._load_sentence_model(
+                    SentenceTransformer, model_name, backend, onnx_file
+                ),
+            )
+            encode_context = self._precision_context(model)
 
             def st_embed(text: str) -> List[float]:
-                return model.encode(text).tolist()
+                with encode_context():
+                    embedding = model.encode(text, normalize_embeddings=True)
+                return np.asarray(embedding, dtype=np.float32).tolist()
+
+            def st_embed_batch(texts: List[str]) -> np.ndarray:
+                with encode_context():
+                    embeddings = model.encode(
+                        texts,
+                        batch_size=self.batch_size,
+                        show_progress_bar=False,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                    )
+                return np.asarray(embeddings, dtype=np.float32)
 
             self.embedding_function = st_embed
+            self.embed_batch_function = st_embed_batch
         except ImportError:
             print(
                 "⚠️  sentence-transformers not installed. Install with: pip install sentence-transformers"
             )
             self.embedding_function = None
+            self.embed_batch_function = None
         except Exception as e:
             print(f"⚠️  Error initializing sentence-transformers: {e}")
             self.embedding_function = None
+            self.embed_batch_function = None
 
-    def generate_entity_embedding(self, entity: Dict) -> Optional[List[float]]:
+    def _initialize_model2vec(self):
         """
-        Generate embedding for an entity
+        Initialize a model2vec static embedding model
+
+        Static models embed text with a token-vector lookup and mean pooling
+        instead of a transformer forward pass: much faster on CPU and a far
+        smaller memory footprint, at some cost in quality. Suited to bulk
+        encoding of short entity descriptions.
+        """
+        try:
+            from model2vec import StaticModel
+
+            model_name = self.sentence_model_name or _os.getenv(
+                "MODEL2VEC_MODEL", "minishlab/potion-base-8M"
+            )
+            self.model_name = model_name
+            model = _shared_model(
+                ("model2vec", model_name),
+                lambda: StaticModel.from_pretrained(model_name),
+            )
+            self.backend = "model2vec"
+
+            def m2v_embed_batch(texts: List[str]) -> np.ndarray:
+                embeddings = np.asarray(
+                    model.encode(texts, show_progress_bar=False), dtype=np.float32
+                )
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                return embeddings / np.maximum(norms, 1e-12)
+
+            def m2v_embed(text: str) -> List[float]:
+                return m2v_embed_batch([text])[0].tolist()
+
+            self.embedding_function = m2v_embed
+            self.embed_batch_function = m2v_embed_batch
+        except ImportError:
+            print("⚠️  model2vec not installed. Install with: pip install model2vec")
+            self.embedding_function = None
+            self.embed_batch_function = None
+        except Exception as e:
+            print(f"⚠️  Error initializing model2vec: {e}")
+            self.embedding_function = None
+            self.embed_batch_function = None
+
+    def _load_sentence_model(
+        self, model_cls, model_name: str, backend: str, onnx_file: str
+    ) -> Tuple[object, str]:
+        """
+        Load the SentenceTransformer for the requested backend
+
+        Backend "onnx" loads an INT8-quantized ONNX export (`onnx_file`)
+        through ONNX Runtime; any failure, e.g. missing optimum/onnxruntime or
+        no such file, falls back to PyTorch.
+
+        Returns:
+            (model, backend actually used)
+        """
+        if backend == "onnx":
+            try:
+                model = model_cls(
+                    model_name,
+                    device=self.device,
+                    backend="onnx",
+                    model_kwargs={"file_name": onnx_file},
+                )
+                return model, "onnx"
+            except Exception as e:
+                print(f"⚠️  ONNX backend unavailable, using PyTorch: {e}")
+
+        return model_cls(model_name, device=self.device), "torch"
+
+    @staticmethod
+    def _configure_threads() -> int:
+        """
+        Pin the intra-op thread count for CPU inference
+
+        Uses TORCH_THREADS, defaulting to the CPUs this process may run on
+        (which respects container cpusets, unlike os.cpu_count()), and a
+        single inter-op thread since encode calls run one at a time. OpenMP
+        and MKL read OMP_NUM_THREADS / MKL_NUM_THREADS when numpy and torch
+        are imported, so those must be set in the environment before startup.
+
+        Returns:
+            The chosen thread count
+        """
+        try:
+            available = len(_os.sched_getaffinity(0))
+        except AttributeError:  # pragma: no cover - not available on macOS
+            available = _os.cpu_count() or 2
+        threads = int(_os.getenv("TORCH_THREADS") or available)
+
+        try:
+            import torch
+        except ImportError:
+            return threads
+
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work started
+            pass
+        return threads
+
+    @staticmethod
+    def _select_device() -> str:
+        """Pick the encoder device: ST_DEVICE override, else CUDA, then MPS, then CPU"""
+        device = _os.getenv("ST_DEVICE")
+        if device:
+            return device
+
+        try:
+            import torch
+        except ImportError:
+            return "cpu"
+
+        if torch.cuda.is_available():
+            return "cuda"
+        mps = getattr(torch.backends, "mps", None)
+        if mps is not None and mps.is_available():
+            return "mps"
+        return "cpu"
+
+    def _precision_context(self, model):
+        """
+        Pick the inference precision for the encoder
+
+        EMBEDDING_PRECISION selects fp32, fp16 or bf16; the default "auto"
+        uses fp16 on CUDA and fp32 elsewhere. Low precision runs under
+        torch.autocast, which keeps reductions (softmax, layer norm,
+        normalization) in fp32, and the output is upcast to fp32.
+
+        Returns:
+            Zero-argument callable returning a context manager for encode calls
+        """
+        precision = _os.getenv("EMBEDDING_PRECISION", "auto").lower()
+        if self.backend == "onnx":
+            # Precision is fixed by the exported (quantized) ONNX graph
+            self.precision = "int8"
+            return contextlib.nullcontext
+        try:
+            import torch
+        except ImportError:
+            self.precision = "fp32"
+            return contextlib.nullcontext
+
+        device_type = getattr(getattr(model, "device", None), "type", "cpu")
+        if precision == "auto":
+            precision = "fp16" if device_type == "cuda" else "fp32"
+
+        dtype = {"fp16": torch.float16, "bf16": torch.bfloat16}.get(precision)
+        if dtype is torch.float16 and device_type != "cuda":
+            print("⚠️  fp16 inference needs a CUDA device, using fp32")
+            dtype = None
+
+        if dtype is None:
+            self.precision = "fp32"
+            return contextlib.nullcontext
+
+        self.precision = precision
+        return lambda: torch.autocast(device_type=device_type, dtype=dtype)
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        """Stable digest of the embedding input text, stored as `embedding_text_hash`"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _build_entity_text(self, entity: Dict) -> str:
+        """
+        Build the text that is fed to the embedding model for an entity
 
         Args:
             entity: Entity dictionary with name, type, description, and enriched fields
 
         Returns:
-            Embedding vector or None
+            Combined embedding input text
         """
-        if not self.embedding_function:
-            return None
-
-        # Combine name and description for embedding
-        name = entity.get("name", "")
         entity_type = entity.get("type", "")
 
+        # For Company entities, include enriched fields for richer embeddings
+        if entity_type == "Company":
+            return self._build_company_text(entity)
+
         # Prefer enriched description over basic description
         description = entity.get("enriched_description") or entity.get(
             "description", ""
         )
-
-        # Start with basic text
-        text_parts = [f"{entity_type}: {name}"]
-
         if description:
-            text_parts.append(description)
-
-        # For Company entities, include enriched fields for richer embeddings
-        if entity_type == "Company":
-            # Known enrichment fields (in priority order)
-            known_fields = {
-                "headquarters": lambda v: f"Located in {v}",
-                "founded_year": lambda v: f"Founded in {v}",
-                "founders": lambda v: f"Founded by {', '.join(str(f) for f in (v[:3] if isinstance(v, list) else [v]))}",
-                "products": lambda v: f"Products: {', '.join(str(p) for p in (v[:5] if isinstance(v, list) else [v]))}",
-                "technologies": lambda v: f"Technologies: {', '.join(str(t) for t in (v[:10] if isinstance(v, list) else [v]))}",
-                "funding_total": lambda v: f"Raised {v}",
-                "funding_stage": None,  # Handled with funding_total
-                "employee_count": lambda v: f"{v} employees",
-                "pricing_model": lambda v: f"Pricing: {v}",
-                "website_url": None,  # Skip URL in embedding text
-                "description": None,  # Already handled above
-                "enriched_description": None,  # Already handled above
-                "enrichment_status": None,  # Metadata, skip
-                "enrichment_timestamp": None,  # Metadata, skip
-                "enrichment_confidence": None,  # Metadata, skip
-            }
-
-            # Process known fields first
-            if entity.get("headquarters"):
-                text_parts.append(f"Located in {entity['headquarters']}")
-
-            if entity.get("founded_year"):
-                text_parts.append(f"Founded in {entity['founded_year']}")
-
-            if entity.get("founders"):
-                founders = entity["founders"]
-                if isinstance(founders, list) and founders:
-                    founders_str = ", ".join(str(f) for f in founders[:3])
-                    text_parts.append(f"Founded by {founders_str}")
-
-            if entity.get("products"):
-                products = entity["products"]
-                if isinstance(products, list) and products:
-                    products_str = ", ".join(str(p) for p in products[:5])
-                    text_parts.append(f"Products: {products_str}")
-
-            if entity.get("technologies"):
-                technologies = entity["technologies"]
-                if isinstance(technologies, list) and technologies:
-                    tech_str = ", ".join(str(t) for t in technologies[:10])
-                    text_parts.append(f"Technologies: {tech_str}")
-
+            return f"{entity_type}: {entity.get('name', '')}. {description}"
+        return f"{entity_type}: {entity.get('name', '')}"
+
+    @staticmethod
+    def _build_company_text(entity: Dict) -> str:
+        """Company specialization of _build_entity_text over known enrichment fields"""
+        get = entity.get
+        description = get("enriched_description") or get("description", "")
+        headquarters = get("headquarters")
+        founded_year = get("founded_year")
+        founders = get("founders")
+        products = get("products")
+        technologies = get("technologies")
+        funding = get("funding_total")
+        stage = get("funding_stage")
+        employee_count = get("employee_count")
+        pricing_model = get("pricing_model")
+
+        text_parts = [
+            f"Company: {get('name', '')}",
+            description,
+            headquarters and f"Located in {headquarters}",
+            founded_year and f"Founded in {founded_year}",
+            isinstance(founders, list)
+            and founders
+            and f"Founded by {', '.join(map(str, founders[:3]))}",
+            isinstance(products, list)
+            and products
+            and f"Products: {', '.join(map(str, products[:5]))}",
+            isinstance(technologies, list)
+            and technologies
+            and f"Technologies: {', '.join(map(str, technologies[:10]))}",
             # Funding information (combine total and stage)
-            if entity.get("funding_total"):
-                funding = entity["funding_total"]
-                stage = entity.get("funding_stage", "")
-                if stage:
-                    text_parts.append(f"Raised {funding} in {stage}")
-                else:
-                    text_parts.append(f"Raised {funding}")
-
-            if entity.get("employee_count"):
-                text_parts.append(f"{entity['employee_count']} employees")
-
-            if entity.get("pricing_model"):
-                text_parts.append(f"Pricing: {entity['pricing_model']}")
-
-            # Dynamically include any other enrichment properties not in known_fields
-            # This allows new properties to be automatically included in embeddings
-            skip_keys = set(known_fields.keys()) | {
-                "id",
-                "name",
-                "type",
-                "description",
-                "enriched_description",
-            }
+            funding
+            and (f"Raised {funding} in {stage}" if stage else f"Raised {funding}"),
+            employee_count and f"{employee_count} employees",
+            pricing_model and f"Pricing: {pricing_model}",
+        ]
+        text_parts = [part for part in text_parts if part]
+
+        # Dynamically include any other enrichment properties not handled above
+        # This allows new properties to be automatically included in embeddings
+        if entity.keys() - _COMPANY_TEXT_SKIP_KEYS:
             for key, value in entity.items():
-                if key in skip_keys or value is None:
+                if key in _COMPANY_TEXT_SKIP_KEYS or value is None:
                     continue
 
                 # Handle lists
-                if isinstance(value, list) and value:
-                    value_str = ", ".join(str(v) for v in value[:5])
-                    text_parts.append(f"{key.replace('_', ' ').title()}: {value_str}")
-                # Handle dicts (like social_links)
-                elif isinstance(value, dict) and value:
-                    # Include key info from dict
-                    keys_str = ", ".join(str(k) for k in list(value.keys())[:3])
-                    text_parts.append(f"{key.replace('_', ' ').title()}: {keys_str}")
+                if isinstance(value, list):
+                    if value:
+                        value_str = ", ".join(str(v) for v in value[:5])
+                        text_parts.append(f"{_field_title(key)}: {value_str}")
+                # Handle dicts (like social_links): include key info from dict
+                elif isinstance(value, dict):
+                    if value:
+                        keys_str = ", ".join(str(k) for k in list(value)[:3])
+                        text_parts.append(f"{_field_title(key)}: {keys_str}")
                 # Handle primitives
-                elif not isinstance(value, (dict, list)):
-                    text_parts.append(f"{key.replace('_', ' ').title()}: {value}")
+                else:
+                    text_parts.append(f"{_field_title(key)}: {value}")
 
         # Combine all parts
-        text = ". ".join(text_parts)
+        return ". ".join(text_parts)
+
+    def generate_entity_embedding(self, entity: Dict) -> Optional[List[float]]:
+        """
+        Generate embedding for an entity
+
+        Args:
+            entity: Entity dictionary with name, type, description, and enriched fields
+
+        Returns:
+            Embedding vector or None
+        """
+        if not self.embedding_function:
+            return None
+
+        text = self._build_entity_text(entity)
 
         try:
             embedding = self.embedding_function(text)
@@ -181,14 +740,203 @@ class EmbeddingGenerator:
             print(f"⚠️  Error generating embedding: {e}")
             return None
 
+    def _storage_properties(self, embedding: List[float]) -> Dict:
+        """
+        Node properties storing an embedding in the configured EMBEDDING_STORAGE
+
+        Properties of the other formats are set to null so that switching formats
+        does not leave stale vectors behind. `embedding_dim` is stored alongside
+        so dimension mismatches can be filtered without decoding vectors.
+        """
+        properties = dict.fromkeys(_VECTOR_PROPERTIES)
+        if self.storage == "int8":
+            data, scale = quantize_int8(embedding)
+            properties["embedding_q"] = data
+            properties["embedding_scale"] = scale
+        elif self.storage == "float16":
+            properties["embedding_fp16"] = np.asarray(
+                embedding, dtype=np.float16
+            ).tobytes()
+        else:
+            properties["embedding"] = embedding
+        properties["embedding_dim"] = len(embedding)
+        return properties
+
+    def _write_embeddings(
+        self, session, rows: List[Dict], label: Optional[str] = None
+    ) -> int:
+        """
+        Persist a batch of embeddings with a single UNWIND statement
+
+        Args:
+            session: Open Neo4j session
+            rows: Dicts with id, vector (storage properties) and text_hash keys
+            label: Optional node label to narrow the MATCH
+
+        Returns:
+            Number of rows written (0 if the batch failed)
+        """
+        if not rows:
+            return 0
+
+        node = f"e:{label}" if label else "e"
+        query = f"""
+            UNWIND $rows AS row
+            MATCH ({node} {{id: row.id}})
+            SET e += row.vector,
+                e.embedding_model = $model,
+                e.embedding_normalized = true,
+                e.embedding_text_hash = row.text_hash,
+                e.embedding_fingerprint = $fingerprint,
+                e.embedding_updated = timestamp()
+        """
+
+        def write_batch(tx):
+            tx.run(
+                query,
+                rows=rows,
+                model=self.embedding_model,
+                fingerprint=self.fingerprint,
+            ).consume()
+
+        try:
+            # Managed transaction: retried by the driver on transient errors
+            session.execute_write(write_batch)
+            self.invalidate_corpus()
+            return len(rows)
+        except Exception as e:
+            print(f"⚠️  Error storing batch of {len(rows)} embeddings: {e}")
+            return 0
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Identity of the vectors this generator produces, stored as
+        `embedding_fingerprint`
+
+        Covers the resolved model, runtime backend (and ONNX export),
+        inference precision and storage format, so changing any of them
+        re-encodes entities even when their input text is unchanged.
+        """
+        onnx_file = self.onnx_file if self.backend == "onnx" else None
+        return "|".join(
+            str(part)
+            for part in (
+                self.embedding_model,
+                self.model_name,
+                self.backend,
+                onnx_file,
+                self.precision,
+                self.storage,
+            )
+        )
+
+    def _is_unchanged(self, record, text_hash: str) -> bool:
+        """True if the stored embedding was built from the same text and encoder"""
+        return bool(
+            record.get("has_embedding")
+            and record.get("text_hash") == text_hash
+            and record.get("stored_fingerprint") == self.fingerprint
+        )
+
+    def _encode_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed a batch of texts, running the model once per distinct text
+
+        Args:
+            texts: Embedding input texts
+
+        Returns:
+            Embeddings aligned with `texts` (None where encoding failed)
+        """
+        unique: Dict[str, int] = {}
+        order = [unique.setdefault(text, len(unique)) for text in texts]
+
+        # One batched model call for the whole page when the backend supports it.
+        # Texts go in sorted by length so every sub-batch pads to a similar
+        # length whether or not the backend sorts internally.
+        if self.embed_batch_function is not None:
+            try:
+                unique_texts = list(unique)
+                by_length = np.argsort(
+                    [len(text) for text in unique_texts], kind="stable"
+                )
+                encoded = self.embed_batch_function(
+                    [unique_texts[i] for i in by_length]
+                )
+                vectors = np.empty_like(encoded)
+                vectors[by_length] = encoded
+                vectors = vectors.tolist()
+                return [vectors[i] for i in order]
+            except Exception as e:
+                print(f"⚠️  Batch encoding failed, encoding one by one: {e}")
+
+        unique_embeddings: List[Optional[List[float]]] = []
+        for text in unique:
+            try:
+                unique_embeddings.append(self.embedding_function(text))
+            except Exception as e:
+                print(f"⚠️  Error generating embedding: {e}")
+                unique_embeddings.append(None)
+
+        return [unique_embeddings[i] for i in order]
+
+    def _embed_page(
+        self,
+        page: List[Tuple[str, str, str]],
+        memo: Optional[Dict[str, np.ndarray]] = None,
+    ) -> List[Dict]:
+        """
+        Embed a page of entities into rows for _write_embeddings
+
+        Entities with identical text (e.g. name-only stubs) are encoded once.
+        Texts that repeat within a page are also remembered in `memo`, so
+        later pages of the same run reuse them; one-off texts are not kept.
+
+        Args:
+            page: (id, text, text_hash) tuples
+            memo: text_hash -> embedding of repeated texts encoded in this run
+
+        Returns:
+            Rows for the entities that were embedded successfully
+        """
+        if not page:
+            return []
+
+        memo = {} if memo is None else memo
+        pending = {h: text for _id, text, h in page if h not in memo}
+        encoded = dict(zip(pending, self._encode_texts(list(pending.values()))))
+        counts = Counter(h for _id, _text, h in page)
+        for h, embedding in encoded.items():
+            if embedding and counts[h] > 1 and len(memo) < self.RUN_MEMO_SIZE:
+                memo[h] = np.asarray(embedding, dtype=np.float32)
+
+        rows = []
+        for entity_id, text, h in page:
+            embedding = encoded.get(h)
+            if not embedding and h in memo:
+                embedding = memo[h].tolist()
+            if embedding:
+                rows.append(
+                    {
+                        "id": entity_id,
+                        "vector": self._storage_properties(embedding),
+                        "text_hash": h,
+                    }
+                )
+        return rows
+
     def generate_embeddings_for_all_entities(
-        self, entity_type: Optional[str] = None
+        self, entity_type: Optional[str] = None, force: bool = False
     ) -> Dict:
         """
         Generate embeddings for all entities in graph
 
         Args:
             entity_type: Optional entity type filter
+            force: Re-encode every entity; when False, entities whose input text
+                and encoder (see `fingerprint`) are unchanged since the last run
+                are skipped
 
         Returns:
             Statistics dictionary
@@ -196,196 +944,544 @@ class EmbeddingGenerator:
         if not self.embedding_function:
             return {"error": "Embedding function not initialized"}
 
-        with self.driver.session() as session:
-            # Only Company nodes have enrichment properties, so we conditionally access them
-            if entity_type:
-                if entity_type == "Company":
-                    # Company nodes: include all enrichment properties
-                    query = f"""
-                        MATCH (e:{entity_type})
-                        WHERE NOT e:Article
-                        RETURN e.id as id, e.name as name, labels(e)[0] as type,
-                               COALESCE(e.description, '') as description,
-                               e.enriched_description as enriched_description,
-                               e.headquarters as headquarters,
-                               e.founded_year as founded_year,
-                               e.founders as founders,
-                               e.products as products,
-                               e.technologies as technologies,
-                               e.funding_total as funding_total,
-                               e.funding_stage as funding_stage
-                    """
-                else:
-                    # Non-Company nodes: exclude enrichment properties
-                    query = f"""
-                        MATCH (e:{entity_type})
-                        WHERE NOT e:Article
-                        RETURN e.id as id, e.name as name, labels(e)[0] as type,
-                               COALESCE(e.description, '') as description,
-                               null as enriched_description,
-                               null as headquarters,
-                               null as founded_year,
-                               null as founders,
-                               null as products,
-                               null as technologies,
-                               null as funding_total,
-                               null as funding_stage
-                    """
-            else:
-                # All entities: conditionally access enrichment properties only for Company nodes
-                query = """
-                    MATCH (e)
-                    WHERE NOT e:Article
-                    RETURN e.id as id, e.name as name, labels(e)[0] as type,
-                           COALESCE(e.description, '') as description,
-                           CASE WHEN 'Company' IN labels(e) THEN e.enriched_description ELSE null END as enriched_description,
-                           CASE WHEN 'Company' IN labels(e) THEN e.headquarters ELSE null END as headquarters,
-                           CASE WHEN 'Company' IN labels(e) THEN e.founded_year ELSE null END as founded_year,
-                           CASE WHEN 'Company' IN labels(e) THEN e.founders ELSE null END as founders,
-                           CASE WHEN 'Company' IN labels(e) THEN e.products ELSE null END as products,
-                           CASE WHEN 'Company' IN labels(e) THEN e.technologies ELSE null END as technologies,
-                           CASE WHEN 'Company' IN labels(e) THEN e.funding_total ELSE null END as funding_total,
-                           CASE WHEN 'Company' IN labels(e) THEN e.funding_stage ELSE null END as funding_stage
-                """
+        # Writes run on a worker thread with their own session: running them on
+        # the read session would make the driver buffer the whole remaining
+        # result in memory, and overlapping them with encoding hides write latency
+        with (
+            self.driver.session(fetch_size=self.READ_FETCH_SIZE) as session,
+            _BackgroundWriter(self) as writer,
+        ):
+            # Only Company nodes carry enrichment properties; on other nodes the
+            # direct property access simply returns null
+            node = f"e:{entity_type}" if entity_type else "e"
+            query = f"""
+                MATCH ({node})
+                WHERE NOT e:Article
+                RETURN e.id as id, e.name as name, labels(e)[0] as type,
+                       COALESCE(e.description, '') as description,
+                       e.enriched_description as enriched_description,
+                       e.headquarters as headquarters,
+                       e.founded_year as founded_year,
+                       e.founders as founders,
+                       e.products as products,
+                       e.technologies as technologies,
+                       e.funding_total as funding_total,
+                       e.funding_stage as funding_stage,
+                       e.embedding_text_hash as text_hash,
+                       e.embedding_fingerprint as stored_fingerprint,
+                       e[$vector_property] IS NOT NULL as has_embedding
+            """
 
-            result = session.run(query)
+            result = session.run(
+                query, vector_property=STORAGE_PROPERTIES[self.storage]
+            )
 
-            generated_count = 0
-            failed_count = 0
+            queued_count = 0
             enriched_count = 0
+            skipped_count = 0
+            page: List[Tuple[str, str, str]] = []
+            memo: Dict[str, np.ndarray] = {}
+
+            read_entity = _entity_fields_reader(result.keys())
 
             for record in result:
-                entity = {
-                    "name": record["name"],
-                    "type": record["type"],
-                    "description": record.get("description", ""),
-                    "enriched_description": record.get("enriched_description"),
-                    "headquarters": record.get("headquarters"),
-                    "founded_year": record.get("founded_year"),
-                    "founders": record.get("founders"),
-                    "products": record.get("products"),
-                    "technologies": record.get("technologies"),
-                    "funding_total": record.get("funding_total"),
-                    "funding_stage": record.get("funding_stage"),
-                }
+                entity = read_entity(record)
 
                 # Track if this entity has enriched data
                 if entity.get("enriched_description"):
                     enriched_count += 1
 
-                embedding = self.generate_entity_embedding(entity)
-
-                if embedding:
-                    # Store embedding in Neo4j
-                    # Note: Neo4j supports vector storage, but for simplicity
-                    # we'll store as list property
-                    try:
-                        session.run(
-                            """
-                            MATCH (e {id: $id})
-                            SET e.embedding = $embedding,
-                                e.embedding_model = $model,
-                                e.embedding_updated = timestamp()
-                        """,
-                            id=record["id"],
-                            embedding=embedding,
-                            model=self.embedding_model,
-                        )
-                        generated_count += 1
-                    except Exception as e:
-                        print(f"⚠️  Error storing embedding for {record['name']}: {e}")
-                        failed_count += 1
-                else:
-                    failed_count += 1
+                text = self._build_entity_text(entity)
+                text_hash = self._text_hash(text)
+                if not force and self._is_unchanged(record, text_hash):
+                    skipped_count += 1
+                    continue
 
-            return {
-                "generated": generated_count,
-                "failed": failed_count,
-                "enriched": enriched_count,
-                "model": self.embedding_model,
-            }
+                page.append((record["id"], text, text_hash))
+                if len(page) >= self.WRITE_BATCH_SIZE:
+                    writer.submit(self._embed_page(page, memo))
+                    queued_count += len(page)
+                    page = []
 
-    def find_similar_entities(self, query_text: str, limit: int = 10) -> List[Dict]:
+            writer.submit(self._embed_page(page, memo))
+            queued_count += len(page)
+
+        if writer.written:
+            self.ensure_vector_index(writer.dimensions)
+
+        return {
+            "generated": writer.written,
+            "failed": queued_count - writer.written,
+            "skipped": skipped_count,
+            "enriched": enriched_count,
+            "model": self.embedding_model,
+        }
+
+    def _embed_query(self, query_text: str) -> Optional[np.ndarray]:
         """
-        Find entities similar to query text using embeddings
+        Embed query text, reusing cached vectors for repeated queries
 
         Args:
             query_text: Query text
-            limit: Maximum number of results
 
         Returns:
-            List of similar entities with similarity scores
+            float32 query vector or None
         """
-        if not self.embedding_function:
-            return []
+        with self._query_cache_lock:
+            cached = self._query_cache.get(query_text)
+            if cached is not None:
+                self._query_cache.move_to_end(query_text)
+                return cached
+
+        # The batch encoder returns float32 arrays directly, skipping the
+        # round trip through a list of Python floats (float64 on re-read)
+        if self.embed_batch_function is not None:
+            query_vec = np.ascontiguousarray(
+                self.embed_batch_function([query_text])[0], dtype=np.float32
+            )
+        else:
+            embedding = self.embedding_function(query_text)
+            if not embedding:
+                return None
+            query_vec = np.asarray(embedding, dtype=np.float32)
+
+        # Cached vectors are shared between calls; guard them against mutation
+        query_vec.setflags(write=False)
+        with self._query_cache_lock:
+            self._query_cache[query_text] = query_vec
+            self._query_cache.move_to_end(query_text)
+            if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return query_vec
+
+    @staticmethod
+    def _embedding_row(record, dim: int):
+        """
+        Extract a stored embedding and validate it against the expected dimension
 
-        # Generate query embedding
-        query_embedding = self.embedding_function(query_text)
+        Returns the value in a form that can be assigned directly into a
+        float32 matrix row (the list itself, or a zero-copy view over raw
+        float32 / float16 / int8 bytes, widened on assignment), or None if it
+        is empty or has the wrong dimension. Int8 rows are not rescaled: the
+        per-vector scale cancels out when the corpus rows are L2-normalized.
+        """
+        value = record.get("embedding")
+        if value:
+            if isinstance(value, (bytes, bytearray)):
+                if len(value) != dim * 4:
+                    return None
+                return np.frombuffer(value, dtype=np.float32)
+            if len(value) != dim:
+                return None
+            return value
+
+        half = record.get("embedding_fp16")
+        if half:
+            if len(half) != dim * 2:
+                return None
+            return np.frombuffer(half, dtype=np.float16)
+
+        quantized = record.get("embedding_q")
+        if quantized and len(quantized) == dim:
+            return np.frombuffer(quantized, dtype=np.int8)
+        return None
+
+    def _load_corpus(self, dim: int) -> _Corpus:
+        """
+        Load all stored entity embeddings of the given dimension into memory
 
-        if not query_embedding:
-            return []
+        Rows are stored L2-normalized (or normalized once here for older,
+        float16 and int8 vectors) so that a query only needs a single
+        matrix-vector product. Rows whose stored `embedding_dim` differs are
+        filtered out server-side.
+
+        Args:
+            dim: Embedding dimension to keep (mismatched rows are skipped)
+
+        Returns:
+            Resident similarity corpus
+        """
+        entities: List[Dict] = []
+        # Preallocated rows, grown by doubling, so each record is copied
+        # straight into the matrix instead of being kept as a Python list
+        matrix = np.empty((self.CORPUS_INITIAL_ROWS, dim), dtype=np.float32)
+        count = 0
+        # Float vectors written by this class are stored L2-normalized already
+        all_normalized = True
 
-        # Find similar entities (cosine similarity)
         with self.driver.session() as session:
-            # Get all entities with embeddings
             result = session.run(
                 """
                 MATCH (e)
-                WHERE NOT e:Article AND e.embedding IS NOT NULL
+                WHERE NOT e:Article
+                  AND (e.embedding IS NOT NULL
+                       OR e.embedding_fp16 IS NOT NULL
+                       OR e.embedding_q IS NOT NULL)
+                  AND coalesce(e.embedding_dim, $dim) = $dim
                 RETURN e.id as id, e.name as name, labels(e)[0] as type,
                        e.description as description, e.embedding as embedding,
+                       e.embedding_fp16 as embedding_fp16,
+                       e.embedding_q as embedding_q,
+                       e.embedding_normalized as normalized,
                        e.source_articles as source_articles
-            """
+            """,
+                dim=dim,
             )
 
-            similarities = []
-            query_vec = np.array(query_embedding)
-
             for record in result:
-                entity_embedding = record["embedding"]
-                if not entity_embedding:
+                row = self._embedding_row(record, dim)
+                # Dimension mismatch (e.g., OpenAI 1536 vs ST 384); skip this entity
+                if row is None:
                     continue
 
-                entity_vec = np.array(entity_embedding)
+                if count == matrix.shape[0]:
+                    grown = np.empty((count * 2, dim), dtype=np.float32)
+                    grown[:count] = matrix
+                    matrix = grown
+                matrix[count] = row
+                count += 1
+                if not record.get("normalized") or record.get("embedding") is None:
+                    all_normalized = False
 
-                # Skip if embedding dimensions don't match
-                if (
-                    query_vec.ndim != 1
-                    or entity_vec.ndim != 1
-                    or query_vec.shape[0] != entity_vec.shape[0]
-                ):
-                    # Dimension mismatch (e.g., OpenAI 1536 vs ST 384); skip this entity
-                    continue
+                entities.append(
+                    {
+                        "id": record["id"],
+                        "name": record["name"],
+                        "type": record["type"],
+                        "description": record.get("description", ""),
+                        "source_articles": record.get("source_articles"),
+                    }
+                )
+
+        matrix = matrix[:count]
+        if count and not all_normalized:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+
+        return _Corpus(
+            dim=dim,
+            matrix=matrix,
+            entities=entities,
+            loaded_at=time.monotonic(),
+            ann_index=self._build_ann_index(matrix),
+        )
+
+    def _build_ann_index(self, matrix: np.ndarray) -> Optional[object]:
+        """
+        Build a FAISS HNSW index over normalized embeddings for large corpora
+
+        Returns None when faiss is not installed or the corpus is small enough
+        for the exact matrix-vector scan.
+        """
+        if faiss is None or matrix.shape[0] < self.ANN_MIN_CORPUS_SIZE:
+            return None
+
+        try:
+            # Inner product on unit vectors == cosine similarity
+            index = faiss.IndexHNSWFlat(
+                matrix.shape[1], self.HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            index.add(matrix)
+            return index
+        except Exception as e:
+            print(f"⚠️  Error building FAISS index, using exact search: {e}")
+            return None
+
+    def _get_corpus(self, dim: int) -> _Corpus:
+        """Return the resident corpus, reloading it if missing, stale or of another dimension"""
+        with self._corpus_lock:
+            corpus = self._corpus
+            if (
+                corpus is None
+                or corpus.dim != dim
+                or time.monotonic() - corpus.loaded_at > self.corpus_max_age_seconds
+            ):
+                corpus = self._load_corpus(dim)
+                self._corpus = corpus
+            return corpus
+
+    def invalidate_corpus(self):
+        """Drop the resident similarity corpus so the next search reloads it"""
+        self._corpus = None
+
+    def ensure_vector_index(self, dimensions: int) -> bool:
+        """
+        Create native cosine vector indexes on `embedding` for all entity labels
+
+        Neo4j vector indexes cover a single label, so one index is created per
+        entity label (idempotent via IF NOT EXISTS). Requires Neo4j 5.11+ and
+        float32 list storage. Called after bulk embedding generation; searches
+        only use the indexes once Neo4j reports them all ONLINE.
+
+        Args:
+            dimensions: Embedding dimension of the configured model
+
+        Returns:
+            True if the indexes exist (or were created)
+        """
+        if self.storage != "float32":
+            return False
+
+        try:
+            with self.driver.session() as session:
+                for label in VECTOR_INDEX_LABELS:
+                    session.run(
+                        f"""
+                        CREATE VECTOR INDEX {_vector_index_name(label)} IF NOT EXISTS
+                        FOR (e:{label}) ON (e.embedding)
+                        OPTIONS {{indexConfig: {{
+                            `vector.dimensions`: {int(dimensions)},
+                            `vector.similarity_function`: 'cosine'
+                        }}}}
+                    """
+                    ).consume()
+            return True
+        except Exception as e:
+            print(f"⚠️  Vector index unavailable, using in-memory search: {e}")
+            return False
+
+    def _vector_indexes_online(self) -> bool:
+        """
+        True if every entity label's vector index exists and is ONLINE
+
+        A POPULATING index can fail queries or return a partial top-k, so
+        searches wait until all of them are fully built.
+        """
+        names = [_vector_index_name(label) for label in VECTOR_INDEX_LABELS]
+        try:
+            with self.driver.session() as session:
+                record = session.run(
+                    """
+                    SHOW INDEXES YIELD name, type, state
+                    WHERE type = 'VECTOR' AND state = 'ONLINE' AND name IN $names
+                    RETURN count(*) as online
+                """,
+                    names=names,
+                ).single()
+            return bool(record) and record["online"] == len(names)
+        except Exception as e:
+            print(f"⚠️  Could not check vector indexes, using in-memory search: {e}")
+            return False
+
+    def _search_vector_index(
+        self, query_vec: np.ndarray, limit: int
+    ) -> Optional[List[Dict]]:
+        """
+        Top-k search through the native HNSW vector indexes
 
-                # Calculate cosine similarity
-                similarity = np.dot(query_vec, entity_vec) / (
-                    np.linalg.norm(query_vec) * np.linalg.norm(entity_vec)
+        Returns:
+            Results, or None if the indexes are unavailable (e.g. Neo4j < 5.11,
+            not created yet, still populating, or non-float32 storage)
+        """
+        if time.monotonic() < self._vector_index_retry_at:
+            return None
+
+        if not self._vector_index_ready:
+            self._vector_index_ready = self._vector_indexes_online()
+            if not self._vector_index_ready:
+                self._vector_index_retry_at = (
+                    time.monotonic() + self.corpus_max_age_seconds
                 )
+                return None
+
+        branches = " UNION ALL ".join(
+            f"CALL db.index.vector.queryNodes('{_vector_index_name(label)}', "
+            f"$limit, $embedding) YIELD node, score RETURN node, score"
+            for label in VECTOR_INDEX_LABELS
+        )
+        # Neo4j reports cosine scores as (1 + cos) / 2; map back to cosine
+        query = f"""
+            CALL {{ {branches} }}
+            RETURN node.id as id, node.name as name, labels(node)[0] as type,
+                   node.description as description,
+                   node.source_articles as source_articles,
+                   2 * score - 1 as similarity
+            ORDER BY similarity DESC
+            LIMIT $limit
+        """
 
-                similarities.append(
+        try:
+            with self.driver.session() as session:
+                result = session.run(query, limit=limit, embedding=query_vec.tolist())
+                return [
                     {
                         "id": record["id"],
                         "name": record["name"],
                         "type": record["type"],
                         "description": record.get("description", ""),
-                        "similarity": float(similarity),
                         "source_articles": record.get("source_articles"),
+                        "similarity": float(record["similarity"]),
                     }
+                    for record in result
+                ]
+        except Exception as e:
+            print(f"⚠️  Vector index query failed, using in-memory search: {e}")
+            self._vector_index_ready = False
+            self._vector_index_retry_at = time.monotonic() + self.corpus_max_age_seconds
+            return None
+
+    def _search_server_side(
+        self, query_vec: np.ndarray, limit: int
+    ) -> Optional[List[Dict]]:
+        """
+        Exact top-k scan computed inside Neo4j with gds.similarity.cosine
+
+        Only the top-k rows cross the network instead of every stored vector.
+
+        Returns:
+            Results, or None if the GDS library is not installed or the
+            query failed
+        """
+        if time.monotonic() < self._server_scan_retry_at:
+            return None
+
+        query = """
+            MATCH (e)
+            WHERE NOT e:Article AND e.embedding IS NOT NULL
+              AND size(e.embedding) = $dim
+            WITH e, gds.similarity.cosine($embedding, e.embedding) AS similarity
+            ORDER BY similarity DESC
+            LIMIT $limit
+            RETURN e.id as id, e.name as name, labels(e)[0] as type,
+                   e.description as description,
+                   e.source_articles as source_articles,
+                   similarity
+        """
+
+        try:
+            with self.driver.session() as session:
+                result = session.run(
+                    query,
+                    limit=limit,
+                    dim=int(query_vec.shape[0]),
+                    embedding=query_vec.tolist(),
                 )
+                return [
+                    {
+                        "id": record["id"],
+                        "name": record["name"],
+                        "type": record["type"],
+                        "description": record.get("description", ""),
+                        "source_articles": record.get("source_articles"),
+                        "similarity": float(record["similarity"]),
+                    }
+                    for record in result
+                ]
+        except Exception as e:
+            print(f"⚠️  GDS similarity scan failed, using in-memory search: {e}")
+            self._server_scan_retry_at = time.monotonic() + self.corpus_max_age_seconds
+            return None
+
+    def _search_corpus(self, query_vec: np.ndarray, limit: int) -> List[Dict]:
+        """Top-k search over the resident in-memory corpus"""
+        query_norm = np.linalg.norm(query_vec)
+        if query_norm == 0:
+            return []
+
+        corpus = self._get_corpus(query_vec.shape[0])
+        if not corpus.entities:
+            return []
+
+        query_unit = query_vec / query_norm
+
+        # Approximate top-k over HNSW for large corpora
+        if corpus.ann_index is not None:
+            corpus.ann_index.hnsw.efSearch = max(limit * 4, 64)
+            scores, indices = corpus.ann_index.search(query_unit[None, :], limit)
+            return [
+                {**corpus.entities[i], "similarity": float(score)}
+                for score, i in zip(scores[0], indices[0])
+                if i >= 0
+            ]
+
+        # Fused JIT scan + top-k for large corpora: no N-length score array
+        if numba is not None and corpus.matrix.shape[0] >= self.JIT_MIN_CORPUS_SIZE:
+            top, scores = _topk_dot(corpus.matrix, query_unit, limit)
+            return [
+                {**corpus.entities[i], "similarity": float(score)}
+                for i, score in zip(top, scores)
+            ]
+
+        # Cosine similarity as a single matrix-vector product
+        similarities = corpus.matrix @ query_unit
+
+        # Select the top results in O(N), then sort only those
+        if limit < similarities.shape[0]:
+            top = np.argpartition(-similarities, limit)[:limit]
+        else:
+            top = np.arange(similarities.shape[0])
+        top = top[np.argsort(-similarities[top])]
+        return [
+            {**corpus.entities[i], "similarity": float(similarities[i])} for i in top
+        ]
+
+    def find_similar_entities(self, query_text: str, limit: int = 10) -> List[Dict]:
+        """
+        Find entities similar to query text using embeddings
 
-            # Sort by similarity and return top results
-            similarities.sort(key=lambda x: x["similarity"], reverse=True)
-            return similarities[:limit]
+        Uses Neo4j's native vector indexes when available, so vectors never
+        leave the server, then an exact scan inside Neo4j with the GDS
+        library's gds.similarity.cosine. Otherwise similarity is computed
+        against an in-memory, pre-normalized matrix of all entity embeddings
+        that is reloaded after writes or once it is older than
+        `corpus_max_age_seconds`; corpora of at least ANN_MIN_CORPUS_SIZE
+        entities are searched through a FAISS HNSW index when faiss is
+        installed.
 
-    def update_embeddings(self, entity_type: Optional[str] = None) -> Dict:
-        """Update embeddings for entities (regenerate if model changed)"""
-        return self.generate_embeddings_for_all_entities(entity_type)
+        Args:
+            query_text: Query text
+            limit: Maximum number of results
 
-    def regenerate_enriched_company_embeddings(self) -> Dict:
+        Returns:
+            List of similar entities with similarity scores
+        """
+        if not self.embedding_function or limit <= 0:
+            return []
+
+        # Generate query embedding (cached for repeated queries)
+        query_vec = self._embed_query(query_text)
+
+        if query_vec is None or query_vec.ndim != 1:
+            return []
+
+        if self.storage == "float32":
+            results = self._search_vector_index(query_vec, limit)
+            if results:
+                return results
+            results = self._search_server_side(query_vec, limit)
+            if results is not None:
+                return results
+
+        return self._search_corpus(query_vec, limit)
+
+    def update_embeddings(
+        self, entity_type: Optional[str] = None, force: bool = False
+    ) -> Dict:
+        """
+        Update embeddings for entities (regenerate if text or model changed)
+
+        Args:
+            entity_type: Optional entity type filter
+            force: Re-encode every entity even if its input text is unchanged
+
+        Returns:
+            Statistics dictionary
+        """
+        return self.generate_embeddings_for_all_entities(entity_type, force=force)
+
+    def regenerate_enriched_company_embeddings(self, force: bool = False) -> Dict:
         """
         Regenerate embeddings specifically for companies with enriched data
 
         This ensures enriched company intelligence is reflected in semantic search.
+        Companies whose embedding input text is unchanged since the last run
+        (same `embedding_text_hash` and `embedding_fingerprint`) are skipped
+        unless `force` is set.
+
+        Args:
+            force: Re-encode every enriched company
 
         Returns:
             Statistics dictionary
@@ -393,7 +1489,10 @@ class EmbeddingGenerator:
         if not self.embedding_function:
             return {"error": "Embedding function not initialized"}
 
-        with self.driver.session() as session:
+        with (
+            self.driver.session(fetch_size=self.READ_FETCH_SIZE) as session,
+            _BackgroundWriter(self, "Company") as writer,
+        ):
             # All nodes now have enrichment properties initialized, so we can query directly
             query = """
                 MATCH (c:Company)
@@ -408,53 +1507,48 @@ class EmbeddingGenerator:
                        c.technologies as technologies,
                        c.funding_total as funding_total,
                        c.funding_stage as funding_stage,
-                       c.enrichment_confidence as confidence
+                       c.enrichment_confidence as confidence,
+                       c.embedding_text_hash as text_hash,
+                       c.embedding_fingerprint as stored_fingerprint,
+                       c[$vector_property] IS NOT NULL as has_embedding
             """
 
-            result = session.run(query)
+            result = session.run(
+                query, vector_property=STORAGE_PROPERTIES[self.storage]
+            )
+
+            queued_count = 0
+            skipped_count = 0
+            page: List[Tuple[str, str, str]] = []
+            memo: Dict[str, np.ndarray] = {}
 
-            regenerated_count = 0
-            failed_count = 0
+            read_entity = _entity_fields_reader(result.keys())
 
             for record in result:
-                entity = {
-                    "name": record["name"],
-                    "type": record["type"],
-                    "description": record.get("description", ""),
-                    "enriched_description": record.get("enriched_description"),
-                    "headquarters": record.get("headquarters"),
-                    "founded_year": record.get("founded_year"),
-                    "founders": record.get("founders"),
-                    "products": record.get("products"),
-                    "technologies": record.get("technologies"),
-                    "funding_total": record.get("funding_total"),
-                    "funding_stage": record.get("funding_stage"),
-                }
-
-                embedding = self.generate_entity_embedding(entity)
-
-                if embedding:
-                    try:
-                        session.run(
-                            """
-                            MATCH (c:Company {id: $id})
-                            SET c.embedding = $embedding,
-                                c.embedding_model = $model,
-                                c.embedding_updated = timestamp()
-                        """,
-                            id=record["id"],
-                            embedding=embedding,
-                            model=self.embedding_model,
-                        )
-                        regenerated_count += 1
-                    except Exception as e:
-                        print(f"⚠️  Error updating embedding for {record['name']}: {e}")
-                        failed_count += 1
-                else:
-                    failed_count += 1
+                entity = read_entity(record)
+
+                # Skip the model entirely when the input text is unchanged
+                text = self._build_entity_text(entity)
+                text_hash = self._text_hash(text)
+                if not force and self._is_unchanged(record, text_hash):
+                    skipped_count += 1
+                    continue
+
+                page.append((record["id"], text, text_hash))
+                if len(page) >= self.WRITE_BATCH_SIZE:
+                    writer.submit(self._embed_page(page, memo))
+                    queued_count += len(page)
+                    page = []
+
+            writer.submit(self._embed_page(page, memo))
+            queued_count += len(page)
+
+        if writer.written:
+            self.ensure_vector_index(writer.dimensions)
 
-            return {
-                "regenerated": regenerated_count,
-                "failed": failed_count,
-                "model": self.embedding_model,
-            }
+        return {
+            "regenerated": writer.written,
+            "failed": queued_count - writer.written,
+            "skipped": skipped_count,
+            "model": self.embedding_model,
+        }
@@ -3,10 +3,43 @@ Enhanced data validation with funding amounts, dates, and cross-referencing
 """
 
 import re
+import string
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
-
+# Recent validation results kept per validator: the same amounts and dates
+# recur across the relationships of a document
+_VALIDATION_CACHE_SIZE = 256
+
+# Funding amounts: $50M, $50 million, $50,000,000, $50M USD, 50M, etc.
+_FUNDING_RE = re.compile(
+    r"\$?\s*([\d,]+\.?\d*)\s*(M|million|B|billion|K|thousand|k)?", re.IGNORECASE
+)
+
+# ISO dates: YYYY-MM-DD on its own, or followed by THH:MM:SS and anything
+# fromisoformat accepts after it (fractions, offsets, Z)
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:$|T\d{2}:\d{2}:\d{2})")
+
+# Numeric fallback date formats, using the field patterns datetime.strptime
+# uses for %Y, %m and %d so they accept exactly the same strings, with the
+# group positions of (year, month, day)
+_YEAR = r"(\d\d\d\d)"
+_MONTH = r"(1[0-2]|0[1-9]|[1-9])"
+_DAY = r"(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])"
+_NUMERIC_DATE_FORMATS = [
+    (re.compile(rf"{_YEAR}-{_MONTH}-{_DAY}"), (0, 1, 2)),  # %Y-%m-%d
+    (re.compile(rf"{_MONTH}/{_DAY}/{_YEAR}"), (2, 0, 1)),  # %m/%d/%Y
+    (re.compile(rf"{_DAY}/{_MONTH}/{_YEAR}"), (2, 1, 0)),  # %d/%m/%Y
+]
+
+# Letters, numbers, spaces, hyphens, apostrophes and periods. The character
+# set covers plain spaces; the regex is only needed for other whitespace.
+_ENTITY_NAME_CHARS = frozenset(string.ascii_letters + string.digits + " -'.")
+_ENTITY_NAME_RE = re.compile(r"^[A-Za-z0-9\s\-\'\.]+$")
+
+
+@lru_cache(maxsize=_VALIDATION_CACHE_SIZE)
 def validate_funding_amount(amount: str) -> Tuple[bool, Optional[str]]:
     """
     Validate and normalize funding amount
@@ -24,53 +57,49 @@ def validate_funding_amount(amount: str) -> Tuple[bool, Optional[str]]:
     amount = amount.strip()
 
     # Extract number and unit
-    # Patterns: $50M, $50 million, $50,000,000, $50M USD, 50M, etc.
-    patterns = [
-        r"\$?\s*([\d,]+\.?\d*)\s*(M|million|B|billion|K|thousand|k)?",
-        r"([\d,]+\.?\d*)\s*(M|million|B|billion|K|thousand|k)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, amount, re.IGNORECASE)
-        if match:
-            number_str = match.group(1).replace(",", "")
-            unit = match.group(2).upper() if match.group(2) else ""
-
-            try:
-                number = float(number_str)
-
-                # Convert to millions
-                if unit in ["B", "BILLION"]:
-                    value_millions = number * 1000
-                elif unit in ["K", "THOUSAND"]:
-                    value_millions = number / 1000
-                elif unit in ["M", "MILLION"] or unit == "":
-                    value_millions = number
-                else:
-                    value_millions = number
-
-                # Validate range ($1M - $10B)
-                if value_millions < 1:
-                    return (
-                        False,
-                        f"Funding amount too small: ${value_millions:.2f}M (minimum $1M)",
-                    )
-                if value_millions > 10000:
-                    return (
-                        False,
-                        f"Funding amount too large: ${value_millions:.2f}M (maximum $10B)",
-                    )
-
-                # Return normalized format
-                normalized = f"${value_millions:.2f}M"
-                return True, normalized
-
-            except ValueError:
-                return False, f"Invalid number format in funding amount: {amount}"
+    match = _FUNDING_RE.search(amount)
+    if match:
+        number_str = match.group(1)
+        if "," in number_str:
+            number_str = number_str.replace(",", "")
+        unit = match.group(2).upper() if match.group(2) else ""
+
+        try:
+            number = float(number_str)
+
+            # Convert to millions
+            if unit in ["B", "BILLION"]:
+                value_millions = number * 1000
+            elif unit in ["K", "THOUSAND"]:
+                value_millions = number / 1000
+            elif unit in ["M", "MILLION"] or unit == "":
+                value_millions = number
+            else:
+                value_millions = number
+
+            # Validate range ($1M - $10B)
+            if value_millions < 1:
+                return (
+                    False,
+                    f"Funding amount too small: ${value_millions:.2f}M (minimum $1M)",
+                )
+            if value_millions > 10000:
+                return (
+                    False,
+                    f"Funding amount too large: ${value_millions:.2f}M (maximum $10B)",
+                )
+
+            # Return normalized format
+            normalized = f"${value_millions:.2f}M"
+            return True, normalized
+
+        except ValueError:
+            return False, f"Invalid number format in funding amount: {amount}"
 
     return False, f"Could not parse funding amount: {amount}"
 
 
+@lru_cache(maxsize=_VALIDATION_CACHE_SIZE)
 def validate_date_format(
     date_str: str, format_type: str = "iso"
 ) -> Tuple[bool, Optional[str]]:
@@ -90,52 +119,54 @@ def validate_date_format(
     date_str = date_str.strip()
 
     # Try ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
-    iso_patterns = [
-        r"^\d{4}-\d{2}-\d{2}$",
-        r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}",
-        r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[-+]\d{2}:\d{2}$",
-    ]
-
-    for pattern in iso_patterns:
-        if re.match(pattern, date_str):
-            try:
-                # Parse and validate
-                if "T" in date_str:
-                    dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                else:
-                    dt = datetime.strptime(date_str, "%Y-%m-%d")
-
-                # Check reasonable date range (1990-2100)
-                if dt.year < 1990:
-                    return False, f"Date too old: {date_str} (minimum 1990)"
-                if dt.year > 2100:
-                    return False, f"Date too far in future: {date_str} (maximum 2100)"
-
-                return True, date_str
-
-            except ValueError:
-                return False, f"Invalid date format: {date_str}"
+    if _ISO_DATE_RE.match(date_str):
+        try:
+            # Parse and validate
+            if "T" in date_str:
+                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            elif date_str.isascii():
+                # YYYY-MM-DD: slice the fields instead of running strptime
+                dt = datetime(
+                    int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])
+                )
+            else:
+                dt = datetime.strptime(date_str, "%Y-%m-%d")
+
+            # Check reasonable date range (1990-2100)
+            if dt.year < 1990:
+                return False, f"Date too old: {date_str} (minimum 1990)"
+            if dt.year > 2100:
+                return False, f"Date too far in future: {date_str} (maximum 2100)"
+
+            return True, date_str
+
+        except ValueError:
+            return False, f"Invalid date format: {date_str}"
 
     if format_type == "iso":
         return False, f"Date not in ISO format: {date_str}"
 
-    # Try other common formats
-    common_formats = [
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-        "%d/%m/%Y",
-        "%B %d, %Y",
-    ]
-
-    for fmt in common_formats:
+    # Try other common formats: numeric ones are matched and built directly
+    for pattern, (year, month, day) in _NUMERIC_DATE_FORMATS:
+        match = pattern.fullmatch(date_str)
+        if not match:
+            continue
+        fields = match.groups()
         try:
-            dt = datetime.strptime(date_str, fmt)
-            if 1990 <= dt.year <= 2100:
-                # Normalize to ISO
-                normalized = dt.strftime("%Y-%m-%d")
-                return True, normalized
+            dt = datetime(int(fields[year]), int(fields[month]), int(fields[day]))
         except ValueError:
             continue
+        if 1990 <= dt.year <= 2100:
+            # Normalize to ISO
+            return True, dt.strftime("%Y-%m-%d")
+
+    # Month names depend on the locale, so leave them to strptime
+    try:
+        dt = datetime.strptime(date_str, "%B %d, %Y")
+        if 1990 <= dt.year <= 2100:
+            return True, dt.strftime("%Y-%m-%d")
+    except ValueError:
+        pass
 
     return False, f"Could not parse date: {date_str}"
 
@@ -168,7 +199,7 @@ def validate_entity_name_format(name: str) -> Tuple[bool, Optional[str]]:
             return False, f"Entity name should start with capital letter: '{name}'"
 
     # Check for valid characters (letters, numbers, spaces, hyphens, apostrophes)
-    if not re.match(r"^[A-Za-z0-9\s\-\'\.]+$", name):
+    if not (_ENTITY_NAME_CHARS.issuperset(name) or _ENTITY_NAME_RE.match(name)):
         return False, f"Entity name contains invalid characters: '{name}'"
 
     return True, None
@@ -248,6 +279,26 @@ def cross_reference_entity(
     return False, None
 
 
+def _build_entity_lookup(known_entities: List[Dict]) -> Dict[str, Optional[str]]:
+    """
+    Index known entities by uppercased name and alias
+
+    Earlier entries win, matching the scan order of cross_reference_entity.
+
+    Args:
+        known_entities: List of known valid entities
+
+    Returns:
+        Dictionary mapping uppercased name or alias -> known entity name
+    """
+    lookup: Dict[str, Optional[str]] = {}
+    for known in known_entities:
+        lookup.setdefault(known.get("name", "").upper(), known.get("name"))
+        for alias in known.get("aliases", []):
+            lookup.setdefault(alias.upper(), known.get("name"))
+    return lookup
+
+
 def validate_extraction_enhanced(
     extraction: Dict, known_entities: Optional[List[Dict]] = None
 ) -> Tuple[bool, List[str]]:
@@ -266,6 +317,9 @@ def validate_extraction_enhanced(
     entities = extraction.get("entities", [])
     relationships = extraction.get("relationships", [])
 
+    # Index known entities once instead of scanning them for every entity
+    known_lookup = _build_entity_lookup(known_entities) if known_entities else None
+
     # Validate entity names
     for i, entity in enumerate(entities):
         name = entity.get("name", "")
@@ -274,8 +328,10 @@ def validate_extraction_enhanced(
             errors.append(f"Entity {i} name format error: {error}")
 
         # Cross-reference if known entities provided
-        if known_entities:
-            is_known, canonical_name = cross_reference_entity(entity, known_entities)
+        if known_lookup is not None:
+            key = entity.get("name", "").upper()
+            is_known = key in known_lookup
+            canonical_name = known_lookup.get(key)
             if not is_known and canonical_name:
                 # Suggest canonical name
                 errors.append(
@@ -5,12 +5,45 @@ Improve entity type classification with confidence scores and multi-signal analy
 
 import re
 from collections import Counter
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - falls back to substring scans
+    ahocorasick = None
 
 
 class EntityClassifier:
     """Refine entity type classification with confidence scores"""
 
+    # Names that are both well-known companies and surnames, and those of them
+    # that default to a person without context
+    AMBIGUOUS_NAMES = frozenset({"ford", "gates", "jobs", "bezos", "musk"})
+    AMBIGUOUS_PERSON_NAMES = frozenset({"gates", "jobs", "bezos", "musk"})
+
+    # Distinct inputs memoized per scoring method; extractions repeat the same
+    # entities many times across validation and disambiguation passes
+    CACHE_SIZE = 4096
+
+    # Substrings checked by _apply_heuristics, matched in the same pass as the
+    # type keywords
+    PERSON_TITLES = frozenset({"mr", "mrs", "ms", "dr", "professor", "prof"})
+    TECHNOLOGY_MARKERS = frozenset({"algorithm", "framework", "protocol"})
+    PRODUCT_MARKERS = frozenset({"app", "service", "platform"})
+    LOCATION_INDICATORS = frozenset(
+        {"located", "based", "headquarters", "city", "country"}
+    )
+    EVENT_INDICATORS = frozenset({"conference", "summit", "event", "meeting", "show"})
+    HEURISTIC_MARKERS = (
+        PERSON_TITLES
+        | TECHNOLOGY_MARKERS
+        | PRODUCT_MARKERS
+        | LOCATION_INDICATORS
+        | EVENT_INDICATORS
+        | {"venture capital", "vc", "angel", "corporate"}
+    )
+
     def __init__(self):
         # Keywords for each entity type
         self.type_keywords = {
@@ -122,6 +155,65 @@ class EntityClassifier:
             ],
         }
 
+        self._build_keyword_matcher()
+
+        # Scoring is deterministic in its string inputs, so memoize per instance.
+        # Keyword scans are shared by all scorers: a name or description is
+        # scanned once no matter how many methods look at it.
+        self._match_keywords = lru_cache(maxsize=self.CACHE_SIZE)(self._scan_keywords)
+        self._refine_cached = lru_cache(maxsize=self.CACHE_SIZE)(
+            self._refine_classification
+        )
+        self._investor_subtype_cached = lru_cache(maxsize=self.CACHE_SIZE)(
+            self._classify_investor_subtype
+        )
+        self._confidence_cached = lru_cache(maxsize=self.CACHE_SIZE)(
+            self._classification_confidence
+        )
+
+    def _build_keyword_matcher(self):
+        """
+        Index type keywords and heuristic markers for single-pass matching
+
+        Builds an Aho-Corasick automaton over every keyword so one scan of a
+        text finds all keywords it contains (substring semantics, as with
+        `kw in text`). Without pyahocorasick, matching falls back to one
+        substring check per distinct keyword.
+        """
+        # Keyword -> entity types listing it, with repeats (a keyword listed
+        # twice for a type counts twice)
+        self._keyword_types: Dict[str, List[str]] = {
+            marker: [] for marker in self.HEURISTIC_MARKERS
+        }
+        for entity_type, keywords in self.type_keywords.items():
+            for keyword in keywords:
+                self._keyword_types.setdefault(keyword, []).append(entity_type)
+
+        self._keyword_automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in self._keyword_types:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._keyword_automaton = automaton
+
+    def _scan_keywords(self, text: str) -> FrozenSet[str]:
+        """Distinct keywords and heuristic markers occurring in `text`"""
+        if not text:
+            return frozenset()
+        if self._keyword_automaton is not None:
+            return frozenset(
+                keyword for _end, keyword in self._keyword_automaton.iter(text)
+            )
+        return frozenset(keyword for keyword in self._keyword_types if keyword in text)
+
+    def _count_type_keywords(self, matched: Set[str]) -> Counter:
+        """Number of each type's keywords among the matched keywords"""
+        counts = Counter()
+        for keyword in matched:
+            counts.update(self._keyword_types[keyword])
+        return counts
+
     def refine_classification(
         self, entity: Dict, context: str = ""
     ) -> Tuple[str, float]:
@@ -138,99 +230,116 @@ class EntityClassifier:
         name = entity.get("name", "").lower()
         current_type = entity.get("type", "").lower()
         description = entity.get("description", "").lower()
-        full_context = f"{name} {description} {context}".lower()
+        return self._refine_cached(name, current_type, description, context)
 
-        # Calculate scores for each type
-        type_scores = {}
-
-        for entity_type, keywords in self.type_keywords.items():
-            score = 0.0
-
-            # Check name
-            name_matches = sum(1 for kw in keywords if kw in name)
-            score += name_matches * 2.0  # Name matches are strong signal
-
-            # Check description
-            desc_matches = sum(1 for kw in keywords if kw in description)
-            score += desc_matches * 1.0
-
-            # Check context
-            if context:
-                context_matches = sum(1 for kw in keywords if kw in context.lower())
-                score += context_matches * 0.5
-
-            type_scores[entity_type] = score
+    def _refine_classification(
+        self, name: str, current_type: str, description: str, context: str
+    ) -> Tuple[str, float]:
+        """refine_classification over lowercased name, type and description"""
+        # Calculate scores for each type from name and description
+        type_scores = self._score_keywords(name, description)
+
+        # Check context (lowercased here, only when there is one)
+        if context:
+            context_counts = self._count_type_keywords(
+                self._match_keywords(context.lower())
+            )
+            for entity_type in type_scores:
+                type_scores[entity_type] += context_counts[entity_type] * 0.5
 
         # Special heuristics
-        type_scores = self._apply_heuristics(name, description, type_scores)
+        type_scores = self._apply_heuristics(
+            self._match_keywords(name), self._match_keywords(description), type_scores
+        )
 
-        # Find best type
-        best_type = max(type_scores.items(), key=lambda x: x[1])
+        # Find best type (first one wins ties) and total score in one pass
+        best_type = None
+        best_score = 0.0
+        total_score = 0.0
+        for entity_type, score in type_scores.items():
+            total_score += score
+            if best_type is None or score > best_score:
+                best_type, best_score = entity_type, score
 
         # Normalize confidence (0-1)
-        total_score = sum(type_scores.values())
         if total_score > 0:
-            confidence = best_type[1] / max(total_score, 1.0)
+            confidence = best_score / max(total_score, 1.0)
         else:
             confidence = 0.5  # Default confidence
 
         # If current type is close, boost its confidence
         if current_type in type_scores:
             current_score = type_scores[current_type]
-            best_score = best_type[1]
 
             if current_score >= best_score * 0.8:  # Within 20% of best
                 refined_type = current_type
                 confidence = max(confidence, 0.7)  # Boost confidence
             else:
-                refined_type = best_type[0]
+                refined_type = best_type
         else:
-            refined_type = best_type[0]
+            refined_type = best_type
 
         return refined_type.upper(), min(1.0, confidence)
 
-    def _apply_heuristics(self, name: str, description: str, scores: Dict) -> Dict:
-        """Apply special heuristics for entity classification"""
+    def _score_keywords(self, name: str, description: str) -> Dict[str, float]:
+        """
+        Keyword score of each entity type for a lowercased name and description
+
+        Name matches count double: they are a stronger signal than the
+        description.
+
+        Returns:
+            New dictionary mapping type -> score
+        """
+        name_counts = self._count_type_keywords(self._match_keywords(name))
+        desc_counts = self._count_type_keywords(self._match_keywords(description))
+        return {
+            entity_type: (name_counts[entity_type] * 2.0)
+            + (desc_counts[entity_type] * 1.0)
+            for entity_type in self.type_keywords
+        }
+
+    def _apply_heuristics(
+        self, name_hits: Set[str], desc_hits: Set[str], scores: Dict
+    ) -> Dict:
+        """
+        Apply special heuristics for entity classification
+
+        Args:
+            name_hits: Keywords and markers found in the lowercased name
+            desc_hits: Keywords and markers found in the lowercased description
+            scores: Type scores to adjust
+        """
 
         # Company vs Person: Check for titles
-        person_titles = ["mr", "mrs", "ms", "dr", "professor", "prof"]
-        if any(title in name for title in person_titles):
+        if not self.PERSON_TITLES.isdisjoint(name_hits):
             scores["person"] += 5.0
             scores["company"] -= 2.0
 
         # Investor subtypes
-        if "venture capital" in description or "vc" in description:
+        if "venture capital" in desc_hits or "vc" in desc_hits:
             scores["investor"] += 3.0
 
-        if "angel" in description:
+        if "angel" in desc_hits:
             scores["investor"] += 3.0
 
-        if "corporate" in description:
+        if "corporate" in desc_hits:
             scores["investor"] += 2.0
             scores["company"] += 1.0
 
         # Technology vs Product
-        if any(tech in description for tech in ["algorithm", "framework", "protocol"]):
+        if not self.TECHNOLOGY_MARKERS.isdisjoint(desc_hits):
             scores["technology"] += 2.0
 
-        if any(prod in description for prod in ["app", "service", "platform"]):
+        if not self.PRODUCT_MARKERS.isdisjoint(desc_hits):
             scores["product"] += 2.0
 
         # Location detection
-        location_indicators = [
-            "located",
-            "based",
-            "headquarters",
-            "headquarters",
-            "city",
-            "country",
-        ]
-        if any(indicator in description for indicator in location_indicators):
+        if not self.LOCATION_INDICATORS.isdisjoint(desc_hits):
             scores["location"] += 1.0
 
         # Event detection
-        event_indicators = ["conference", "summit", "event", "meeting", "show"]
-        if any(indicator in description for indicator in event_indicators):
+        if not self.EVENT_INDICATORS.isdisjoint(desc_hits):
             scores["event"] += 3.0
 
         return scores
@@ -247,7 +356,10 @@ class EntityClassifier:
         """
         description = investor.get("description", "").lower()
         name = investor.get("name", "").lower()
+        return self._investor_subtype_cached(name, description)
 
+    def _classify_investor_subtype(self, name: str, description: str) -> str:
+        """classify_investor_subtype over lowercased name and description"""
         # Check for keywords
         if "venture capital" in description or "vc" in name or "ventures" in name:
             return "VC"
@@ -284,19 +396,14 @@ class EntityClassifier:
         name = entity.get("name", "").lower()
 
         # Special cases
-        if name in ["ford", "gates", "jobs", "bezos", "musk"]:
+        if name in self.AMBIGUOUS_NAMES:
             # Check context: if surrounded by company indicators, it's a company
             # If surrounded by person indicators, it's a person
-            company_indicators = sum(
-                1
-                for e in co_occurring_entities
-                if e.get("type", "").lower() == "company"
-            )
-            person_indicators = sum(
-                1
-                for e in co_occurring_entities
-                if e.get("type", "").lower() == "person"
+            co_occurring_types = Counter(
+                e.get("type", "").lower() for e in co_occurring_entities
             )
+            company_indicators = co_occurring_types["company"]
+            person_indicators = co_occurring_types["person"]
 
             if company_indicators > person_indicators:
                 return "COMPANY", 0.7
@@ -304,13 +411,18 @@ class EntityClassifier:
                 return "PERSON", 0.7
             else:
                 # Default based on common knowledge
-                if name in ["gates", "jobs", "bezos", "musk"]:
+                if name in self.AMBIGUOUS_PERSON_NAMES:
                     return "PERSON", 0.9
                 else:
                     return "COMPANY", 0.9
 
-        # Use default classification
-        return self.refine_classification(entity)
+        # Use default classification (name is already lowercased)
+        return self._refine_cached(
+            name,
+            entity.get("type", "").lower(),
+            entity.get("description", "").lower(),
+            "",
+        )
 
     def get_classification_confidence(self, entity: Dict) -> Dict[str, float]:
         """
@@ -324,24 +436,22 @@ class EntityClassifier:
         """
         name = entity.get("name", "").lower()
         description = entity.get("description", "").lower()
+        # Copy: the cached dict must not be mutated by callers
+        return dict(self._confidence_cached(name, description))
 
-        confidences = {}
-        total_score = 0.0
-
-        for entity_type, keywords in self.type_keywords.items():
-            score = 0.0
-
-            # Count keyword matches
-            name_matches = sum(1 for kw in keywords if kw in name)
-            desc_matches = sum(1 for kw in keywords if kw in description)
+    def _classification_confidence(
+        self, name: str, description: str
+    ) -> Dict[str, float]:
+        """get_classification_confidence over lowercased name and description"""
+        confidences = self._score_keywords(name, description)
+        total_score = sum(confidences.values())
 
-            score = (name_matches * 2.0) + (desc_matches * 1.0)
-            confidences[entity_type] = score
-            total_score += score
+        # All zero: nothing to normalize
+        if total_score <= 0:
+            return confidences
 
         # Normalize to 0-1
-        if total_score > 0:
-            for entity_type in confidences:
-                confidences[entity_type] /= total_score
-
-        return confidences
+        return {
+            entity_type: score / total_score
+            for entity_type, score in confidences.items()
+        }
@@ -4,7 +4,51 @@ Entity name normalization and deduplication utilities
 
 import re
 from difflib import SequenceMatcher
-from typing import Optional
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz, process
+    from rapidfuzz.distance import Indel
+except ImportError:  # pragma: no cover - falls back to difflib
+    fuzz = None
+    Indel = None
+    process = None
+
+# Common suffixes that cause duplicates (matched on the uppercased name)
+_SUFFIXES = [
+    r"INC\.?",
+    r"LLC\.?",
+    r"LTD\.?",
+    r"CORP\.?",
+    r"COMPANY",
+    r"CO\.?",
+    r"PVT\.?",
+    r"LLP\.?",
+    r"LP\.?",
+    r"PLC\.?",
+    r"AG\.?",
+    r"GMBH\.?",
+]
+
+# All suffixes stripped in one pass. Stripping them one at a time in list order
+# removes a trailing run of suffixes only while each one further left comes
+# later in the list ("ACME CO INC" -> "ACME", but "ACME INC CO" -> "ACME INC"),
+# so the alternation is written as a chain of optional groups in reverse list
+# order, which matches exactly those runs.
+_SUFFIX_RE = re.compile(
+    "".join(rf"(?:\s+{suffix})?" for suffix in reversed(_SUFFIXES)) + "$",
+    re.IGNORECASE,
+)
+_SPECIAL_CHARS_RE = re.compile(r"[^\w\s-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Score matrix cells computed per rapidfuzz cdist call in find_duplicates
+# (one byte each), bounding its memory on large name lists
+_CDIST_BLOCK_CELLS = 1 << 24
 
 
 def normalize_entity_name(name: str) -> str:
@@ -24,33 +68,64 @@ def normalize_entity_name(name: str) -> str:
     normalized = name.upper().strip()
 
     # Remove common suffixes/prefixes that cause duplicates
-    suffixes_to_remove = [
-        r"\s+INC\.?$",
-        r"\s+LLC\.?$",
-        r"\s+LTD\.?$",
-        r"\s+CORP\.?$",
-        r"\s+COMPANY$",
-        r"\s+CO\.?$",
-        r"\s+PVT\.?$",
-        r"\s+LLP\.?$",
-        r"\s+LP\.?$",
-        r"\s+PLC\.?$",
-        r"\s+AG\.?$",
-        r"\s+GMBH\.?$",
-    ]
-
-    for suffix in suffixes_to_remove:
-        normalized = re.sub(suffix, "", normalized, flags=re.IGNORECASE)
+    normalized = _SUFFIX_RE.sub("", normalized, count=1)
 
     # Remove special characters except spaces and hyphens
-    normalized = re.sub(r"[^\w\s-]", "", normalized)
+    normalized = _SPECIAL_CHARS_RE.sub("", normalized)
 
     # Normalize whitespace
-    normalized = re.sub(r"\s+", " ", normalized)
+    normalized = _WHITESPACE_RE.sub(" ", normalized)
 
     return normalized.strip()
 
 
+@lru_cache(maxsize=8192)
+def normalize_entity_name_cached(name: str) -> str:
+    """
+    Memoized normalize_entity_name for names that are normalized repeatedly
+
+    Args:
+        name: Original entity name
+
+    Returns:
+        Normalized entity name
+    """
+    return normalize_entity_name(name)
+
+
+def _name_similarity(norm1: str, norm2: str, threshold: float) -> Optional[float]:
+    """
+    Similarity ratio of two normalized names, or None if below `threshold`
+
+    Args:
+        norm1: First normalized name
+        norm2: Second normalized name
+        threshold: Similarity threshold (0-1)
+
+    Returns:
+        Ratio in [threshold, 1], or None when the pair cannot reach it (a
+        ratio of 0.0 is a match for thresholds of 0 or less)
+    """
+    # Exact match after normalization
+    if norm1 == norm2:
+        return 1.0
+
+    # The ratio is at most 2 * shorter / total length; skip hopeless pairs
+    total_len = len(norm1) + len(norm2)
+    if 2 * min(len(norm1), len(norm2)) < threshold * total_len:
+        return None
+
+    # Calculate similarity ratio
+    if Indel is not None:
+        # Indel similarity, with early exit once the cutoff cannot be reached
+        cutoff = min(max(threshold, 0.0), 1.0)
+        ratio = Indel.normalized_similarity(norm1, norm2, score_cutoff=cutoff)
+    else:
+        ratio = SequenceMatcher(None, norm1, norm2).ratio()
+
+    return ratio if ratio >= threshold else None
+
+
 def are_similar_entities(name1: str, name2: str, threshold: float = 0.85) -> bool:
     """
     Check if two entity names are similar (likely duplicates)
@@ -63,17 +138,148 @@ def are_similar_entities(name1: str, name2: str, threshold: float = 0.85) -> boo
     Returns:
         True if names are similar enough to be considered duplicates
     """
-    norm1 = normalize_entity_name(name1)
-    norm2 = normalize_entity_name(name2)
+    norm1 = normalize_entity_name_cached(name1)
+    norm2 = normalize_entity_name_cached(name2)
 
-    # Exact match after normalization
-    if norm1 == norm2:
-        return True
+    return _name_similarity(norm1, norm2, threshold) is not None
 
-    # Calculate similarity ratio
-    ratio = SequenceMatcher(None, norm1, norm2).ratio()
 
-    return ratio >= threshold
+def find_duplicates(
+    names: List[str], threshold: float = 0.85
+) -> List[Tuple[int, int, float]]:
+    """
+    Find all pairs of similar names in a list
+
+    Equivalent to calling are_similar_entities on every pair, but each name is
+    normalized once, and names with the same normalized form are paired
+    directly as exact matches (similarity 1.0), with only one of them taking
+    part in fuzzy matching. Only pairs whose lengths allow the threshold to be
+    reached are compared: names are sorted by normalized length, and each
+    is compared against longer names until the length ratio rules out a match.
+
+    Args:
+        names: Entity names
+        threshold: Similarity threshold (0-1)
+
+    Returns:
+        List of (index_1, index_2, similarity) tuples with index_1 < index_2
+    """
+    # Group names by normalized form; names in one group are exact matches
+    groups = {}
+    for index, name in enumerate(names):
+        groups.setdefault(normalize_entity_name_cached(name), []).append(index)
+    norms = list(groups)
+    members = list(groups.values())
+
+    duplicates = [(i, j, 1.0) for group in members for i, j in combinations(group, 2)]
+
+    # Fuzzy matching between distinct normalized forms
+    order = sorted(range(len(norms)), key=lambda i: len(norms[i]))
+
+    if process is not None and 0 < threshold <= 1:
+        similar = _find_duplicates_cdist(norms, order, threshold)
+    else:
+        similar = []
+        for position, i in enumerate(order):
+            norm1 = norms[i]
+            for j in order[position + 1 :]:
+                norm2 = norms[j]
+                # Later names are only longer, so no further pair can match
+                if 2 * len(norm1) < threshold * (len(norm1) + len(norm2)):
+                    break
+                similarity = _name_similarity(norm1, norm2, threshold)
+                if similarity is not None:
+                    similar.append((i, j, similarity))
+
+    # Every name of one form matches every name of the other
+    for group1, group2, similarity in similar:
+        for i in members[group1]:
+            for j in members[group2]:
+                duplicates.append((min(i, j), max(i, j), similarity))
+
+    return duplicates
+
+
+def _find_duplicates_cdist(
+    norms: List[str], order: List[int], threshold: float
+) -> List[Tuple[int, int, float]]:
+    """
+    find_duplicates over normalized names using rapidfuzz's cdist
+
+    Blocks of names (in length order) are scored in C across all cores
+    against the later names whose length still allows a match, the same
+    window the pairwise loop scans. The cdist cutoff is the one
+    _name_similarity applies, so it only drops pairs _name_similarity would
+    reject; the few pairs left are confirmed with _name_similarity for the
+    exact same result.
+
+    Args:
+        norms: Normalized names
+        order: Indices into `norms` sorted by normalized length
+        threshold: Similarity threshold, in (0, 1]
+
+    Returns:
+        List of (index_1, index_2, similarity) tuples with index_1 < index_2
+    """
+    sorted_norms = [norms[i] for i in order]
+    lengths = [len(norm) for norm in sorted_norms]
+    count = len(sorted_norms)
+
+    duplicates = []
+    start = 0
+    stop = 0
+    while start < count:
+        # Size the block from the window of its shortest name, then widen the
+        # window to cover its longest name
+        stop = _length_window_end(lengths, start, stop, threshold)
+        end = min(count, start + max(1, _CDIST_BLOCK_CELLS // (stop - start)))
+        stop = _length_window_end(lengths, end - 1, stop, threshold)
+
+        # Score this block against itself and the later names in the window;
+        # only the part above the diagonal holds new pairs
+        scores = process.cdist(
+            sorted_norms[start:end],
+            sorted_norms[start:stop],
+            scorer=fuzz.ratio,
+            score_cutoff=threshold * 100,
+            dtype=np.uint8,
+            workers=-1,
+        )
+        for row, col in zip(*np.nonzero(np.triu(scores, k=1))):
+            position1 = start + int(row)
+            position2 = start + int(col)
+            similarity = _name_similarity(
+                sorted_norms[position1], sorted_norms[position2], threshold
+            )
+            if similarity is not None:
+                i, j = order[position1], order[position2]
+                duplicates.append((min(i, j), max(i, j), similarity))
+        start = end
+
+    return duplicates
+
+
+def _length_window_end(
+    lengths: List[int], position: int, stop: int, threshold: float
+) -> int:
+    """
+    End of the length window of the name at `position`
+
+    Args:
+        lengths: Normalized name lengths, ascending
+        position: Position of the name
+        stop: Window end found for an earlier position, to resume from
+        threshold: Similarity threshold (0-1)
+
+    Returns:
+        First position past `position` whose name is too long to reach the
+        threshold against it (ratio is at most 2 * shorter / total length)
+    """
+    length = lengths[position]
+    stop = max(stop, position + 1)
+    while stop < len(lengths) and 2 * length >= threshold * (length + lengths[stop]):
+        stop += 1
+    return stop
 
 
 def get_canonical_name(names: list[str]) -> str:
@@ -93,7 +299,7 @@ def get_canonical_name(names: list[str]) -> str:
     # Prefer longer names as they're usually more complete
     names_with_counts = {}
     for name in names:
-        normalized = normalize_entity_name(name)
+        normalized = normalize_entity_name_cached(name)
         if normalized not in names_with_counts:
             names_with_counts[normalized] = {"original": name, "count": 0}
         names_with_counts[normalized]["count"] += 1
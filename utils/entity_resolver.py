@@ -3,23 +3,79 @@ Entity Resolution and Deduplication
 Merges duplicate entities in the Neo4j graph
 """
 
+import logging
 import re
 from typing import Dict, List, Optional, Set, Tuple
 
 from neo4j import GraphDatabase
 
-from .entity_normalization import (
-    are_similar_entities,
-    get_canonical_name,
-    normalize_entity_name,
-)
+from .entity_normalization import find_duplicates, get_canonical_name
+
+logger = logging.getLogger(__name__)
+
+
+def _quote_label(label: str) -> str:
+    """Backtick-quote a label read from the graph for use in Cypher"""
+    return "`" + label.replace("`", "``") + "`"
+
+
+def _node_pattern(variable: str, label: Optional[str], id_param: str) -> str:
+    """
+    Cypher pattern matching an entity by id, under its label when known
+
+    Args:
+        variable: Pattern variable name
+        label: Node label (from labels(e)[0]) or None
+        id_param: Name of the query parameter holding the id
+
+    Returns:
+        Node pattern without parentheses, e.g. "e1:`Company` {id: $id1}"
+    """
+    if label:
+        return f"{variable}:{_quote_label(label)} {{id: ${id_param}}}"
+    return f"{variable} {{id: ${id_param}}}"
+
+
+def _group_duplicates(duplicates: List[Tuple[str, str, float]]) -> List[List[str]]:
+    """
+    Group duplicate pairs into connected components (union-find)
+
+    If A~B and B~C, A, B and C end up in one group even though A and C were
+    never compared directly.
+
+    Args:
+        duplicates: (entity_id_1, entity_id_2, similarity) tuples
+
+    Returns:
+        Groups of two or more entity ids, ids in first-seen order
+    """
+    parent: Dict[str, str] = {}
+
+    def find(entity_id: str) -> str:
+        parent.setdefault(entity_id, entity_id)
+        while parent[entity_id] != entity_id:
+            parent[entity_id] = parent[parent[entity_id]]
+            entity_id = parent[entity_id]
+        return entity_id
+
+    for entity_id_1, entity_id_2, _ in duplicates:
+        root1, root2 = find(entity_id_1), find(entity_id_2)
+        if root1 != root2:
+            parent[root2] = root1
+
+    groups: Dict[str, List[str]] = {}
+    for entity_id in parent:
+        groups.setdefault(find(entity_id), []).append(entity_id)
+    return [group for group in groups.values() if len(group) > 1]
 
 
 class EntityResolver:
     """Resolve and merge duplicate entities in the graph"""
 
-    def __init__(self, driver: GraphDatabase):
+    def __init__(self, driver: GraphDatabase, merge_batch_size: int = 100):
         self.driver = driver
+        # Duplicate pairs merged per transaction by merge_all_duplicates
+        self.merge_batch_size = merge_batch_size
 
     def find_duplicate_entities(
         self, entity_type: str = None, threshold: float = 0.85
@@ -34,6 +90,19 @@ class EntityResolver:
         Returns:
             List of (entity_id_1, entity_id_2, similarity) tuples
         """
+        duplicates, _, _ = self._find_duplicates_with_names(entity_type, threshold)
+        return duplicates
+
+    def _find_duplicates_with_names(
+        self, entity_type: str = None, threshold: float = 0.85
+    ) -> Tuple[List[Tuple[str, str, float]], Dict[str, str], Dict[str, str]]:
+        """
+        find_duplicate_entities, also returning the names and labels of the
+        entities read
+
+        Returns:
+            (duplicate pairs, {entity_id: name}, {entity_id: label})
+        """
         duplicates = []
 
         with self.driver.session() as session:
@@ -41,7 +110,7 @@ class EntityResolver:
             if entity_type:
                 query = f"""
                     MATCH (e:{entity_type})
-                    RETURN e.id as id, e.name as name
+                    RETURN e.id as id, e.name as name, labels(e)[0] as type
                 """
             else:
                 query = """
@@ -50,36 +119,36 @@ class EntityResolver:
                     RETURN e.id as id, e.name as name, labels(e)[0] as type
                 """
 
-            result = session.run(query)
-            entities = list(result)
-
-            # Compare all pairs
-            for i, entity1 in enumerate(entities):
-                for entity2 in entities[i + 1 :]:
-                    name1 = entity1["name"]
-                    name2 = entity2["name"]
-
-                    # Skip if already merged or same ID
-                    if entity1["id"] == entity2["id"]:
-                        continue
-
-                    # Check similarity
-                    if are_similar_entities(name1, name2, threshold):
-                        similarity = self._calculate_similarity(name1, name2)
-                        duplicates.append((entity1["id"], entity2["id"], similarity))
-
-        return duplicates
-
-    def _calculate_similarity(self, name1: str, name2: str) -> float:
-        """Calculate similarity ratio between two names"""
-        from difflib import SequenceMatcher
-
-        norm1 = normalize_entity_name(name1)
-        norm2 = normalize_entity_name(name2)
-        return SequenceMatcher(None, norm1, norm2).ratio()
+            # Stream the records into id/name/label columns instead of
+            # holding every Record
+            ids = []
+            names = []
+            labels = []
+            for record in session.run(query):
+                ids.append(record["id"])
+                names.append(record["name"])
+                labels.append(record["type"])
+
+        # Compare all pairs (in bulk, in list order); find_duplicates scores
+        # the normalized names and reports the similarity of each pair
+        for i, j, similarity in sorted(find_duplicates(names, threshold)):
+            # Skip if already merged or same ID
+            if ids[i] == ids[j]:
+                continue
+
+            duplicates.append((ids[i], ids[j], similarity))
+
+        names_by_id = dict(zip(ids, names))
+        labels_by_id = dict(zip(ids, labels))
+        return duplicates, names_by_id, labels_by_id
 
     def merge_entities(
-        self, entity_id_1: str, entity_id_2: str, keep_canonical: bool = True
+        self,
+        entity_id_1: str,
+        entity_id_2: str,
+        keep_canonical: bool = True,
+        label_1: Optional[str] = None,
+        label_2: Optional[str] = None,
     ) -> bool:
         """
         Merge two duplicate entities
@@ -88,169 +157,347 @@ class EntityResolver:
             entity_id_1: First entity ID
             entity_id_2: Second entity ID (will be merged into entity_id_1)
             keep_canonical: If True, keep the entity with the longer/more common name
+            label_1: Label of the first entity, if known (makes its lookup an
+                index seek rather than a scan of all nodes)
+            label_2: Label of the second entity, if known
 
         Returns:
             True if merge successful, False otherwise
         """
         with self.driver.session() as session:
-            # Get both entities
-            query1 = """
-                MATCH (e {id: $id})
-                RETURN e.id as id, e.name as name, labels(e)[0] as type, e.description as description
-            """
+            try:
+                # Managed transaction: the merge steps commit together, and
+                # the driver retries them on transient errors
+                return session.execute_write(
+                    self._merge_pair,
+                    entity_id_1,
+                    entity_id_2,
+                    keep_canonical,
+                    label_1,
+                    label_2,
+                )
+            except Exception as e:
+                logger.warning(
+                    "Error merging entities %s and %s: %s", entity_id_1, entity_id_2, e
+                )
+                return False
 
-            result1 = session.run(query1, id=entity_id_1)
-            entity1 = result1.single()
+    def _merge_pair(
+        self,
+        tx,
+        entity_id_1: str,
+        entity_id_2: str,
+        keep_canonical: bool,
+        label_1: Optional[str] = None,
+        label_2: Optional[str] = None,
+    ) -> bool:
+        """
+        Run the statements of merge_entities in a transaction
 
-            result2 = session.run(query1, id=entity_id_2)
-            entity2 = result2.single()
+        Errors are raised rather than reported, so the transaction (which may
+        hold several merges) is rolled back as a whole.
 
-            if not entity1 or not entity2:
-                return False
+        Returns:
+            True if merged, False if either entity does not exist
+        """
+        # Get both entities in one lookup, under their labels when known so
+        # each is an index seek rather than a scan of every node
+        lookup1 = _node_pattern("e", label_1, "id1")
+        lookup2 = _node_pattern("e", label_2, "id2")
+        result = tx.run(
+            f"""
+            CALL {{
+                MATCH ({lookup1})
+                RETURN e
+                UNION
+                MATCH ({lookup2})
+                RETURN e
+            }}
+            RETURN e.id as id, e.name as name, labels(e)[0] as type, e.description as description,
+                   e.source_articles as source_articles
+        """,
+            id1=entity_id_1,
+            id2=entity_id_2,
+        )
+        found = {}
+        for record in result:
+            found.setdefault(record["id"], record)
+        entity1 = found.get(entity_id_1)
+        entity2 = found.get(entity_id_2)
+
+        if not entity1 or not entity2:
+            return False
+
+        # Determine which to keep (canonical name)
+        if keep_canonical:
+            canonical_name = get_canonical_name([entity1["name"], entity2["name"]])
+            if canonical_name == entity2["name"]:
+                # Swap so entity_id_1 becomes the canonical
+                entity_id_1, entity_id_2 = entity_id_2, entity_id_1
+                entity1, entity2 = entity2, entity1
+
+        # Match both entities under their label so the id lookups use the
+        # label's id index instead of scanning every node
+        node1 = _node_pattern("e1", entity1["type"], "id1")
+        node2 = _node_pattern("e2", entity2["type"], "id2")
+
+        # Step 1: Merge properties; the source article lists are unioned here
+        # with a set rather than by a quadratic list filter in Cypher
+        source_articles = self._merge_source_articles(
+            entity1["source_articles"], entity2["source_articles"]
+        )
+        tx.run(
+            f"""
+            MATCH ({node1})
+            MATCH ({node2})
+            WHERE e1.id <> e2.id
+            SET e1.description = coalesce(e1.description, '') + ' | ' + coalesce(e2.description, '')
+            SET e1.source_articles = $source_articles
+            SET e1.article_count = $article_count
+        """,
+            id1=entity_id_1,
+            id2=entity_id_2,
+            source_articles=source_articles,
+            article_count=len(source_articles),
+        )
+
+        # Step 2: Redirect outgoing relationships (simplified)
+        # Get all outgoing relationships from e2
+        outgoing = tx.run(
+            f"""
+            MATCH ({node2})-[r]->(target)
+            RETURN type(r) as rel_type, elementId(target) as target_eid,
+                   properties(r) as props
+        """,
+            id2=entity_id_2,
+        )
+
+        # Copy them onto e1, one UNWIND query per relationship type; the other
+        # end is looked up by element id, and MERGE leaves relationships e1
+        # already has untouched
+        pending = self._pending_relationships(outgoing, "target")
+        for rel_type, rels in pending.items():
+            tx.run(
+                f"""
+                UNWIND $rels AS rel
+                MATCH ({node1})
+                MATCH (t) WHERE elementId(t) = rel.eid
+                MERGE (e1)-[r:{rel_type}]->(t)
+                ON CREATE SET r = rel.props, r.created_at = timestamp()
+            """,
+                id1=entity_id_1,
+                rels=rels,
+            )
+
+        # Delete old outgoing relationships
+        tx.run(
+            f"""
+            MATCH ({node2})-[r]->()
+            DELETE r
+        """,
+            id2=entity_id_2,
+        )
+
+        # Step 3: Redirect incoming relationships
+        incoming = tx.run(
+            f"""
+            MATCH (source)-[r]->({node2})
+            RETURN type(r) as rel_type, elementId(source) as source_eid,
+                   properties(r) as props
+        """,
+            id2=entity_id_2,
+        )
+
+        pending = self._pending_relationships(incoming, "source")
+        for rel_type, rels in pending.items():
+            tx.run(
+                f"""
+                UNWIND $rels AS rel
+                MATCH (s) WHERE elementId(s) = rel.eid
+                MATCH ({node1})
+                MERGE (s)-[r:{rel_type}]->(e1)
+                ON CREATE SET r = rel.props, r.created_at = timestamp()
+            """,
+                id1=entity_id_1,
+                rels=rels,
+            )
+
+        # Step 4: Delete entity2 with its old incoming relationships
+        tx.run(
+            f"""
+            MATCH ({node2})
+            DETACH DELETE e2
+        """,
+            id2=entity_id_2,
+        )
+
+        return True
+
+    @staticmethod
+    def _merge_source_articles(
+        articles1: Optional[List[str]], articles2: Optional[List[str]]
+    ) -> List[str]:
+        """
+        Union of two entities' source_articles, in linear time
 
-            # Determine which to keep (canonical name)
-            if keep_canonical:
-                canonical_name = get_canonical_name([entity1["name"], entity2["name"]])
-                if canonical_name == entity2["name"]:
-                    # Swap so entity_id_1 becomes the canonical
-                    entity_id_1, entity_id_2 = entity_id_2, entity_id_1
-                    entity1, entity2 = entity2, entity1
+        Articles of the first entity that the second lacks come first, then
+        all of the second entity's articles.
 
-            try:
-                # Step 1: Merge properties
-                session.run(
-                    """
-                    MATCH (e1 {id: $id1})
-                    MATCH (e2 {id: $id2})
-                    WHERE e1.id <> e2.id
-                    SET e1.description = coalesce(e1.description, '') + ' | ' + coalesce(e2.description, '')
-                    SET e1.source_articles = CASE
-                        WHEN e1.source_articles IS NULL AND e2.source_articles IS NULL THEN []
-                        WHEN e1.source_articles IS NULL THEN e2.source_articles
-                        WHEN e2.source_articles IS NULL THEN e1.source_articles
-                        ELSE [x IN e1.source_articles WHERE NOT x IN e2.source_articles] + e2.source_articles
-                    END
-                    SET e1.article_count = size(coalesce(e1.source_articles, []))
-                """,
-                    id1=entity_id_1,
-                    id2=entity_id_2,
-                )
+        Args:
+            articles1: source_articles of the surviving entity (or None)
+            articles2: source_articles of the merged entity (or None)
 
-                # Step 2: Redirect outgoing relationships (simplified)
-                # Get all outgoing relationships from e2
-                outgoing = session.run(
-                    """
-                    MATCH (e2 {id: $id2})-[r]->(target)
-                    RETURN type(r) as rel_type, target.id as target_id, properties(r) as props
-                """,
-                    id2=entity_id_2,
-                )
+        Returns:
+            Merged list of article ids
+        """
+        if articles1 is None:
+            return list(articles2 or [])
+        if articles2 is None:
+            return list(articles1)
 
-                for record in outgoing:
-                    rel_type = record["rel_type"]
-                    target_id = record["target_id"]
-                    props = record["props"]
-
-                    # Check if relationship already exists
-                    exists = session.run(
-                        """
-                        MATCH (e1 {id: $id1})-[r]->(t {id: $target_id})
-                        WHERE type(r) = $rel_type
-                        RETURN count(r) > 0 as exists
-                    """,
-                        id1=entity_id_1,
-                        target_id=target_id,
-                        rel_type=rel_type,
-                    )
+        seen = set(articles2)
+        return [x for x in articles1 if x not in seen] + list(articles2)
 
-                    exists_record = exists.single()
-                    if exists_record and not exists_record["exists"]:
-                        # Create new relationship
-                        session.run(
-                            f"""
-                            MATCH (e1 {{id: $id1}})
-                            MATCH (t {{id: $target_id}})
-                            MERGE (e1)-[r:{rel_type}]->(t)
-                            SET r = $props, r.created_at = timestamp()
-                        """,
-                            id1=entity_id_1,
-                            target_id=target_id,
-                            props=props,
-                        )
+    @staticmethod
+    def _pending_relationships(records, end: str) -> Dict[str, List[Dict]]:
+        """
+        Group the relationships to copy onto the surviving entity by type
 
-                # Delete old outgoing relationships
-                session.run(
-                    """
-                    MATCH (e2 {id: $id2})-[r]->()
-                    DELETE r
-                """,
-                    id2=entity_id_2,
-                )
+        Only the first of several relationships of the same type to the same
+        node is kept, so it is the one whose properties are copied; the
+        MERGE creating them skips any the surviving entity already has.
 
-                # Step 3: Redirect incoming relationships
-                incoming = session.run(
-                    """
-                    MATCH (source)-[r]->(e2 {id: $id2})
-                    RETURN type(r) as rel_type, source.id as source_id, properties(r) as props
-                """,
-                    id2=entity_id_2,
-                )
+        Args:
+            records: Relationships of the merged entity (rel_type, <end>_eid, props)
+            end: "target" or "source", the node at the other end
 
-                for record in incoming:
-                    rel_type = record["rel_type"]
-                    source_id = record["source_id"]
-                    props = record["props"]
-
-                    # Check if relationship already exists
-                    exists = session.run(
-                        """
-                        MATCH (s {id: $source_id})-[r]->(e1 {id: $id1})
-                        WHERE type(r) = $rel_type
-                        RETURN count(r) > 0 as exists
-                    """,
-                        source_id=source_id,
-                        id1=entity_id_1,
-                        rel_type=rel_type,
+        Returns:
+            Dictionary mapping relationship type -> list of
+            {"eid": element id, "props": properties} parameter dicts
+        """
+        eid_key = f"{end}_eid"
+        seen = set()
+        pending = {}
+        for record in records:
+            key = (record["rel_type"], record[eid_key])
+            if key in seen:
+                continue
+            seen.add(key)
+            pending.setdefault(record["rel_type"], []).append(
+                {"eid": record[eid_key], "props": record["props"]}
+            )
+        return pending
+
+    def _ensure_id_indexes(self, labels: Set[str]) -> None:
+        """
+        Create an index on id for each of the given labels that has none
+
+        The merge statements match entities as (e:Label {id: ...}), which
+        is an index lookup only when the label's id is indexed. The graph
+        builder's uniqueness constraints cover the standard entity labels;
+        this adds indexes for any other label about to be merged.
+
+        Args:
+            labels: Labels of the entities in the planned merges
+        """
+        if not labels:
+            return
+
+        with self.driver.session() as session:
+            result = session.run(
+                """
+                SHOW INDEXES YIELD entityType, labelsOrTypes, properties
+                WHERE entityType = 'NODE' AND properties = ['id']
+                RETURN labelsOrTypes
+            """
+            )
+            indexed = set()
+            for record in result:
+                indexed.update(record["labelsOrTypes"] or [])
+
+            for label in sorted(labels - indexed):
+                try:
+                    session.run(
+                        f"CREATE INDEX IF NOT EXISTS "
+                        f"FOR (n:{_quote_label(label)}) ON (n.id)"
                     )
+                except Exception as e:
+                    logger.warning("Could not create id index for %s: %s", label, e)
 
-                    exists_record = exists.single()
-                    if exists_record and not exists_record["exists"]:
-                        # Create new relationship
-                        session.run(
-                            f"""
-                            MATCH (s {{id: $source_id}})
-                            MATCH (e1 {{id: $id1}})
-                            MERGE (s)-[r:{rel_type}]->(e1)
-                            SET r = $props, r.created_at = timestamp()
-                        """,
-                            source_id=source_id,
-                            id1=entity_id_1,
-                            props=props,
-                        )
+    def _merge_batch(
+        self, batch: List[Tuple[str, str, Optional[str], Optional[str]]]
+    ) -> List[bool]:
+        """
+        Merge a batch of entities into their survivors in one transaction
 
-                # Delete old incoming relationships
-                session.run(
-                    """
-                    MATCH ()-[r]->(e2 {id: $id2})
-                    DELETE r
-                """,
-                    id2=entity_id_2,
-                )
+        If any merge fails the transaction is rolled back and the batch is
+        merged again pair by pair, so one bad pair only fails itself.
 
-                # Step 4: Delete entity2
-                session.run(
-                    """
-                    MATCH (e2 {id: $id2})
-                    DELETE e2
-                """,
-                    id2=entity_id_2,
-                )
+        Args:
+            batch: (survivor_id, merged_id, survivor_label, merged_label) tuples
 
-                return True
+        Returns:
+            Whether each pair was merged
+        """
+        try:
+            with self.driver.session() as session:
+                with session.begin_transaction() as tx:
+                    results = [
+                        self._merge_pair(
+                            tx,
+                            survivor_id,
+                            merged_id,
+                            False,
+                            survivor_label,
+                            merged_label,
+                        )
+                        for survivor_id, merged_id, survivor_label, merged_label in batch
+                    ]
+                    tx.commit()
+            return results
+        except Exception as e:
+            logger.warning("Batch merge failed, retrying pair by pair: %s", e)
+            return [
+                self.merge_entities(
+                    survivor_id,
+                    merged_id,
+                    keep_canonical=False,
+                    label_1=survivor_label,
+                    label_2=merged_label,
+                )
+                for survivor_id, merged_id, survivor_label, merged_label in batch
+            ]
+
+    @staticmethod
+    def _plan_merges(
+        groups: List[List[str]],
+        names_by_id: Dict[str, str],
+        labels_by_id: Dict[str, str],
+    ) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+        """
+        Pick the canonical entity of each duplicate group as its survivor
 
-            except Exception as e:
-                print(f"⚠️  Error merging entities {entity_id_1} and {entity_id_2}: {e}")
-                return False
+        Returns:
+            (survivor_id, merged_id, survivor_label, merged_label) tuples,
+            every other group member merged into the entity whose name is
+            the group's canonical name
+        """
+        merges = []
+        for group in groups:
+            names = [names_by_id.get(entity_id) or "" for entity_id in group]
+            canonical_name = get_canonical_name(names)
+            survivor_id = group[names.index(canonical_name)]
+            merges.extend(
+                (
+                    survivor_id,
+                    entity_id,
+                    labels_by_id.get(survivor_id),
+                    labels_by_id.get(entity_id),
+                )
+                for entity_id in group
+                if entity_id != survivor_id
+            )
+        return merges
 
     def merge_all_duplicates(
         self, entity_type: str = None, threshold: float = 0.85, dry_run: bool = False
@@ -270,7 +517,9 @@ class EntityResolver:
         print(f"FINDING DUPLICATE ENTITIES")
         print(f"{'='*80}\n")
 
-        duplicates = self.find_duplicate_entities(entity_type, threshold)
+        duplicates, names_by_id, labels_by_id = self._find_duplicates_with_names(
+            entity_type, threshold
+        )
 
         print(f"Found {len(duplicates)} potential duplicate pairs\n")
 
@@ -280,18 +529,35 @@ class EntityResolver:
                 print(f"  Would merge: {id1} <-> {id2} (similarity: {sim:.2f})")
             return {"found": len(duplicates), "merged": 0}
 
+        # Coalesce transitive duplicates so each group is merged once into
+        # its canonical entity, instead of pair by pair into whichever
+        # entity survived the previous pair
+        groups = _group_duplicates(duplicates)
+        merges = self._plan_merges(groups, names_by_id, labels_by_id)
+        self._ensure_id_indexes(
+            {label for merge in merges for label in merge[2:] if label}
+        )
+
+        print(f"Merging {len(merges)} entities into {len(groups)} canonical entities\n")
+
         # Merge duplicates
         merged_count = 0
         failed_count = 0
 
-        for entity_id_1, entity_id_2, similarity in duplicates:
-            if self.merge_entities(entity_id_1, entity_id_2):
-                merged_count += 1
-                print(
-                    f"  ✓ Merged: {entity_id_1} <-> {entity_id_2} (similarity: {similarity:.2f})"
-                )
-            else:
-                failed_count += 1
+        for start in range(0, len(merges), self.merge_batch_size):
+            batch = merges[start : start + self.merge_batch_size]
+            results = self._merge_batch(batch)
+
+            # Per-merge details go to the log rather than a stdout line each
+            for (survivor_id, merged_id, _, _), merged in zip(batch, results):
+                if merged:
+                    merged_count += 1
+                    logger.debug("Merged %s into %s", merged_id, survivor_id)
+                else:
+                    failed_count += 1
+                    logger.warning("Failed to merge %s into %s", merged_id, survivor_id)
+
+            print(f"  Progress: {merged_count + failed_count}/{len(merges)} merges")
 
         print(f"\n{'='*80}")
         print(f"MERGE COMPLETE: {merged_count} merged, {failed_count} failed")
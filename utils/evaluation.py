@@ -3,23 +3,131 @@ Evaluation metrics for the GraphRAG system
 Measures query quality, performance, accuracy, and system health
 """
 
+import asyncio
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 try:
-    from langchain.evaluation import EmbeddingDistance
     from langchain_openai import ChatOpenAI
     HAS_LANGCHAIN_EVAL = True
 except ImportError:
     HAS_LANGCHAIN_EVAL = False
 
 
-@dataclass
+# Per-result columns of EvaluationSummary.to_arrays
+_SUMMARY_DTYPE = np.dtype([
+    ("latency_ms", np.float64),
+    ("tokens_used", np.int64),
+    ("cost_usd", np.float64),
+    ("relevance_score", np.float64),
+    ("accuracy_score", np.float64),
+    ("completeness_score", np.float64),
+    ("coherence_score", np.float64),
+    ("context_relevance", np.float64),
+    ("answer_faithfulness", np.float64),
+    ("answer_relevancy", np.float64),
+    ("cache_hit", np.bool_),
+])
+
+
+def _mean_of_scored(scores: np.ndarray) -> float:
+    """Mean over results where a metric was computed (score > 0), 0.0 if none"""
+    scored = scores[scores > 0]
+    return float(scored.sum()) / max(1, scored.size)
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart, across threads"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self) -> None:
+        """Block until the caller's slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _ResponseCache:
+    """
+    RAG responses by query, matched exactly or by embedding similarity
+    
+    Queries whose normalized embeddings have a cosine similarity of at least
+    `threshold` with an earlier query reuse its response.
+    """
+    
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._exact: Dict[Tuple[str, bool], Dict[str, Any]] = {}
+        # Per use_llm: stored vectors, their responses, and the stacked matrix
+        self._vectors: Dict[bool, List[np.ndarray]] = defaultdict(list)
+        self._responses: Dict[bool, List[Dict[str, Any]]] = defaultdict(list)
+        self._matrix: Dict[bool, np.ndarray] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, query: str, use_llm: bool, vector: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Cached response for the query, or None"""
+        with self._lock:
+            response = self._exact.get((query, use_llm))
+            if response is not None or vector is None or not self._vectors[use_llm]:
+                return response
+            
+            matrix = self._matrix.get(use_llm)
+            if matrix is None or len(matrix) != len(self._vectors[use_llm]):
+                matrix = self._matrix[use_llm] = np.vstack(self._vectors[use_llm])
+            similarities = matrix @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return self._responses[use_llm][best]
+            return None
+    
+    def put(self, query: str, use_llm: bool, vector: Optional[np.ndarray], response: Dict[str, Any]) -> None:
+        """Store the response to a query"""
+        with self._lock:
+            self._exact[(query, use_llm)] = response
+            if vector is not None:
+                self._vectors[use_llm].append(vector)
+                self._responses[use_llm].append(response)
+
+
+# (epoch second, its HH:MM:SS) of the last log timestamp formatted
+_log_clock: Tuple[int, str] = (-1, "")
+
+
+def _log_time() -> str:
+    """Current UTC time as HH:MM:SS for evaluation log lines, formatted once per second"""
+    global _log_clock
+    second = int(time.time())
+    cached_second, text = _log_clock
+    if cached_second != second:
+        text = time.strftime('%H:%M:%S', time.gmtime(second))
+        _log_clock = (second, text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _word_set(text: str) -> frozenset:
+    """Distinct lowercased words of a text, shared by every metric that scores it"""
+    return frozenset(text.lower().split())
+
+
+@dataclass(slots=True)
 class QueryEvaluationResult:
-    """Result of evaluating a single query"""
+    """Result of evaluating a single query (slotted: batches hold thousands)"""
     query: str
     expected_answer: Optional[str] = None
     actual_answer: Optional[str] = None
@@ -59,14 +167,16 @@ class QueryEvaluationResult:
     context_entities: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationSummary:
     """Summary of evaluation results"""
     total_queries: int = 0
     successful_queries: int = 0
     failed_queries: int = 0
     
-    # Performance metrics
+    # Performance metrics; latencies are per query and overlap when the
+    # batch runs concurrently, wall_time_ms is the whole batch's run time
+    wall_time_ms: float = 0.0
     avg_latency_ms: float = 0.0
     p50_latency_ms: float = 0.0
     p95_latency_ms: float = 0.0
@@ -93,14 +203,53 @@ class EvaluationSummary:
     
     # Results
     results: List[QueryEvaluationResult] = field(default_factory=list)
+    
+    def to_arrays(self) -> np.ndarray:
+        """
+        Metric columns of the successful results, e.g. to_arrays()["latency_ms"]
+        
+        Returns:
+            Structured array with one row per successful result
+        """
+        return np.fromiter(
+            (
+                (r.latency_ms, r.tokens_used, r.cost_usd,
+                 r.relevance_score, r.accuracy_score, r.completeness_score, r.coherence_score,
+                 r.context_relevance, r.answer_faithfulness, r.answer_relevancy,
+                 r.cache_hit)
+                for r in self.results
+                if r.success
+            ),
+            dtype=_SUMMARY_DTYPE,
+        )
 
 
 class QueryEvaluator:
     """Evaluate query performance and quality"""
     
-    def __init__(self, rag_instance=None, openai_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        rag_instance=None,
+        openai_api_key: Optional[str] = None,
+        max_workers: int = 16,
+        max_queries_per_second: Optional[float] = None,
+        response_cache_threshold: Optional[float] = None
+    ):
         self.rag_instance = rag_instance
         self.openai_api_key = openai_api_key
+        # Queries in a batch evaluated concurrently (they are bound by RAG/LLM I/O)
+        self.max_workers = max_workers
+        # Optional cap on the rate batch queries are started at, to stay
+        # under LLM API rate limits with many workers
+        self.max_queries_per_second = max_queries_per_second
+        # Optional reuse of RAG responses for repeated or paraphrased queries
+        # (e.g. regression runs re-scoring the same dataset); off by default
+        self._response_cache = None
+        if response_cache_threshold is not None:
+            self._response_cache = _ResponseCache(response_cache_threshold)
+        # Metric details by (query, expected, answer, context); a cached RAG
+        # response repeats an earlier answer and context, so it is not rescored
+        self._cached_scores = lru_cache(maxsize=256)(self._score_answer)
         self.evaluator_llm = None
         
         if openai_api_key and HAS_LANGCHAIN_EVAL:
@@ -117,7 +266,8 @@ class QueryEvaluator:
         self,
         query: str,
         expected_answer: Optional[str] = None,
-        use_llm: bool = True
+        use_llm: bool = True,
+        log_enabled: bool = True
     ) -> QueryEvaluationResult:
         """
         Evaluate a single query
@@ -126,28 +276,30 @@ class QueryEvaluator:
             query: The query to evaluate
             expected_answer: Optional expected answer for accuracy comparison
             use_llm: Whether to use LLM for answer generation
+            log_enabled: Whether to record timestamped steps in result.logs
             
         Returns:
             QueryEvaluationResult with all metrics
         """
         result = QueryEvaluationResult(query=query, expected_answer=expected_answer)
+        
+        def log(message: str) -> None:
+            if log_enabled:
+                result.logs.append(f"[{_log_time()}] {message}")
+        
         start_time = time.time()
         
         try:
-            result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Starting evaluation for query: '{query}'")
+            log(f"Starting evaluation for query: '{query}'")
             
             # Execute query
             query_start = time.time()
-            result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Executing query through RAG system...")
+            log(f"Executing query through RAG system...")
             
-            response = self.rag_instance.query(
-                question=query,
-                return_context=True,
-                use_llm=use_llm
-            )
+            response = self._query_rag(query, use_llm)
             
             query_latency = (time.time() - query_start) * 1000
-            result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Query completed in {query_latency:.2f}ms")
+            log(f"Query completed in {query_latency:.2f}ms")
             
             result.actual_answer = response.get("answer", "")
             result.context_retrieved = response.get("context")
@@ -162,7 +314,7 @@ class QueryEvaluator:
             result.latency_ms = (time.time() - start_time) * 1000
             result.success = True
             
-            result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Intent classified as: {result.intent_classified}")
+            log(f"Intent classified as: {result.intent_classified}")
             
             # Extract metadata if available (response is a dict, not an object)
             if isinstance(response, dict):
@@ -172,14 +324,17 @@ class QueryEvaluator:
                 result.cache_hit = response.get("cache_hit", False)
                 
                 if result.tokens_used > 0:
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Tokens used: {result.tokens_used}, Cost: ${result.cost_usd:.4f}")
+                    log(f"Tokens used: {result.tokens_used}, Cost: ${result.cost_usd:.4f}")
                 if result.cache_hit:
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] ⚡ Cache hit - response served from cache")
+                    log(f"⚡ Cache hit - response served from cache")
             
-            # Analyze context
+            # Analyze context; the context is serialized once here and the
+            # lowercased text is shared by the RAG metrics below
+            context_text = None
             if result.context_retrieved:
                 context_str = str(result.context_retrieved)
                 result.context_size = len(context_str)
+                context_text = context_str.lower()
                 
                 # Try to extract entity names from context
                 if isinstance(result.context_retrieved, dict):
@@ -196,109 +351,225 @@ class QueryEvaluator:
                                             entities.append(str(name))
                     result.context_entities = entities[:10]  # Limit to 10
                 
-                result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Context retrieved: {result.context_size} characters, {len(result.context_entities)} entities identified")
+                log(f"Context retrieved: {result.context_size} characters, {len(result.context_entities)} entities identified")
             
             # Calculate quality metrics
             if result.actual_answer:
-                result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Calculating quality metrics...")
+                log(f"Calculating quality metrics...")
+                
+                scores = self._cached_scores(query, expected_answer, result.actual_answer, context_text)
                 
                 # Relevance calculation
-                relevance_details = self._calculate_relevance_with_details(query, result.actual_answer)
+                relevance_details = scores['relevance']
                 result.relevance_score = relevance_details['score']
                 result.calculation_details['relevance'] = relevance_details
-                result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Relevance score: {result.relevance_score:.3f} ({relevance_details.get('explanation', '')})")
+                log(f"Relevance score: {result.relevance_score:.3f} ({relevance_details.get('explanation', '')})")
                 
                 # Coherence calculation
-                coherence_details = self._calculate_coherence_with_details(result.actual_answer)
+                coherence_details = scores['coherence']
                 result.coherence_score = coherence_details['score']
                 result.calculation_details['coherence'] = coherence_details
-                result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Coherence score: {result.coherence_score:.3f} ({coherence_details.get('explanation', '')})")
+                log(f"Coherence score: {result.coherence_score:.3f} ({coherence_details.get('explanation', '')})")
                 
                 if expected_answer:
                     # Accuracy calculation
-                    accuracy_details = self._calculate_accuracy_with_details(
-                        expected_answer, 
-                        result.actual_answer
-                    )
+                    accuracy_details = scores['accuracy']
                     result.accuracy_score = accuracy_details['score']
                     result.calculation_details['accuracy'] = accuracy_details
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Accuracy score: {result.accuracy_score:.3f} ({accuracy_details.get('explanation', '')})")
+                    log(f"Accuracy score: {result.accuracy_score:.3f} ({accuracy_details.get('explanation', '')})")
                     
                     # Completeness calculation
-                    completeness_details = self._calculate_completeness_with_details(
-                        expected_answer,
-                        result.actual_answer
-                    )
+                    completeness_details = scores['completeness']
                     result.completeness_score = completeness_details['score']
                     result.calculation_details['completeness'] = completeness_details
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Completeness score: {result.completeness_score:.3f} ({completeness_details.get('explanation', '')})")
+                    log(f"Completeness score: {result.completeness_score:.3f} ({completeness_details.get('explanation', '')})")
                 
                 # RAG-specific metrics
                 if result.context_retrieved:
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Calculating RAG metrics...")
+                    log(f"Calculating RAG metrics...")
                     
                     # Context relevance
-                    ctx_rel_details = self._calculate_context_relevance_with_details(
-                        query,
-                        result.context_retrieved
-                    )
+                    ctx_rel_details = scores['context_relevance']
                     result.context_relevance = ctx_rel_details['score']
                     result.calculation_details['context_relevance'] = ctx_rel_details
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Context relevance: {result.context_relevance:.3f} ({ctx_rel_details.get('explanation', '')})")
+                    log(f"Context relevance: {result.context_relevance:.3f} ({ctx_rel_details.get('explanation', '')})")
                     
                     # Answer faithfulness
-                    faithfulness_details = self._calculate_faithfulness_with_details(
-                        result.actual_answer,
-                        result.context_retrieved
-                    )
+                    faithfulness_details = scores['answer_faithfulness']
                     result.answer_faithfulness = faithfulness_details['score']
                     result.calculation_details['answer_faithfulness'] = faithfulness_details
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Answer faithfulness: {result.answer_faithfulness:.3f} ({faithfulness_details.get('explanation', '')})")
+                    log(f"Answer faithfulness: {result.answer_faithfulness:.3f} ({faithfulness_details.get('explanation', '')})")
                     
                     # Answer relevancy
-                    answer_rel_details = self._calculate_answer_relevancy_with_details(
-                        query,
-                        result.actual_answer
-                    )
+                    answer_rel_details = scores['answer_relevancy']
                     result.answer_relevancy = answer_rel_details['score']
                     result.calculation_details['answer_relevancy'] = answer_rel_details
-                    result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] Answer relevancy: {result.answer_relevancy:.3f} ({answer_rel_details.get('explanation', '')})")
+                    log(f"Answer relevancy: {result.answer_relevancy:.3f} ({answer_rel_details.get('explanation', '')})")
             
-            result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] ✅ Evaluation completed successfully")
+            log(f"✅ Evaluation completed successfully")
             
         except Exception as e:
             result.success = False
             result.error = str(e)
             result.latency_ms = (time.time() - start_time) * 1000
-            result.logs.append(f"[{datetime.utcnow().strftime('%H:%M:%S')}] ❌ Error: {str(e)}")
+            log(f"❌ Error: {str(e)}")
         
         return result
     
+    def _query_rag(self, query: str, use_llm: bool) -> Dict[str, Any]:
+        """
+        Run a query through the RAG system, reusing the response to an
+        equivalent earlier query when the response cache is enabled
+        """
+        if self._response_cache is None:
+            return self.rag_instance.query(
+                question=query,
+                return_context=True,
+                use_llm=use_llm
+            )
+        
+        vector = self._embed_query(query)
+        cached = self._response_cache.get(query, use_llm, vector)
+        if cached is not None:
+            return {**cached, "cache_hit": True}
+        
+        response = self.rag_instance.query(
+            question=query,
+            return_context=True,
+            use_llm=use_llm
+        )
+        if isinstance(response, dict):
+            self._response_cache.put(query, use_llm, vector, response)
+        return response
+    
+    def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Normalized query embedding from the RAG system's embedder, or None (exact matching only)"""
+        generator = getattr(self.rag_instance, "embedding_generator", None)
+        embed = getattr(generator, "embedding_function", None)
+        if embed is None:
+            return None
+        
+        try:
+            vector = np.asarray(embed(query), dtype=np.float32)
+        except Exception:
+            return None
+        norm = float(np.linalg.norm(vector))
+        if vector.ndim != 1 or norm == 0.0:
+            return None
+        return vector / norm
+    
+    def _score_answer(
+        self,
+        query: str,
+        expected_answer: Optional[str],
+        answer: str,
+        context_text: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate the quality and RAG metric details of an answer
+        
+        Args:
+            query: The evaluated query
+            expected_answer: Optional expected answer (accuracy, completeness)
+            answer: The RAG system's answer
+            context_text: Lowercased retrieved context, or None if there was none
+            
+        Returns:
+            Dictionary mapping metric name -> details dict
+        """
+        details = {
+            'relevance': self._calculate_relevance_with_details(query, answer),
+            'coherence': self._calculate_coherence_with_details(answer),
+        }
+        
+        if expected_answer:
+            details['accuracy'] = self._calculate_accuracy_with_details(expected_answer, answer)
+            details['completeness'] = self._calculate_completeness_with_details(expected_answer, answer)
+        
+        if context_text is not None:
+            details['context_relevance'] = self._calculate_context_relevance_with_details(query, context_text, context_text)
+            details['answer_faithfulness'] = self._calculate_faithfulness_with_details(answer, context_text, context_text)
+            details['answer_relevancy'] = self._calculate_answer_relevancy_with_details(query, answer)
+        
+        return details
+    
     def evaluate_batch(
         self,
         queries: List[Dict[str, Any]],
-        use_llm: bool = True
+        use_llm: bool = True,
+        log_enabled: bool = True
+    ) -> EvaluationSummary:
+        """
+        Evaluate a batch of queries, up to max_workers at a time
+        
+        Args:
+            queries: List of dicts with 'query' and optionally 'expected_answer'
+            use_llm: Whether to use LLM for answer generation
+            log_enabled: Whether to record per-query logs (see evaluate_query)
+            
+        Returns:
+            EvaluationSummary with aggregated metrics
+        """
+        evaluate = self._batch_evaluator(use_llm, log_enabled)
+        start_time = time.time()
+        
+        if self.max_workers > 1 and len(queries) > 1:
+            # Results keep the order of the input queries
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as executor:
+                results = list(executor.map(evaluate, queries))
+        else:
+            results = [evaluate(query_data) for query_data in queries]
+        
+        return self._summarize_results(results, (time.time() - start_time) * 1000)
+    
+    async def evaluate_batch_async(
+        self,
+        queries: List[Dict[str, Any]],
+        use_llm: bool = True,
+        log_enabled: bool = True,
+        max_concurrent: Optional[int] = None
     ) -> EvaluationSummary:
         """
-        Evaluate a batch of queries
+        Evaluate a batch of queries without blocking the event loop
+        
+        Each query runs in a worker thread (the RAG system is synchronous),
+        with at most max_concurrent (default: max_workers) in flight.
         
         Args:
             queries: List of dicts with 'query' and optionally 'expected_answer'
             use_llm: Whether to use LLM for answer generation
+            log_enabled: Whether to record per-query logs (see evaluate_query)
+            max_concurrent: Queries evaluated at a time
             
         Returns:
             EvaluationSummary with aggregated metrics
         """
-        results = []
+        evaluate = self._batch_evaluator(use_llm, log_enabled)
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(max(1, max_concurrent or self.max_workers))
+        
+        async def evaluate_async(query_data: Dict[str, Any]) -> QueryEvaluationResult:
+            async with semaphore:
+                return await asyncio.to_thread(evaluate, query_data)
         
-        for query_data in queries:
+        # gather keeps the order of the input queries
+        results = await asyncio.gather(*(evaluate_async(query_data) for query_data in queries))
+        return self._summarize_results(list(results), (time.time() - start_time) * 1000)
+    
+    def _batch_evaluator(self, use_llm: bool, log_enabled: bool):
+        """Function evaluating one batch entry, rate limited when configured"""
+        rate_limiter = None
+        if self.max_queries_per_second:
+            rate_limiter = _RateLimiter(self.max_queries_per_second)
+        
+        def evaluate(query_data: Dict[str, Any]) -> QueryEvaluationResult:
+            if rate_limiter is not None:
+                rate_limiter.wait()
             query = query_data.get("query", "")
             expected = query_data.get("expected_answer")
-            
-            result = self.evaluate_query(query, expected, use_llm)
-            results.append(result)
+            return self.evaluate_query(query, expected, use_llm, log_enabled)
         
-        return self._summarize_results(results)
+        return evaluate
     
     def _calculate_relevance(self, query: str, answer: str) -> float:
         """Calculate how relevant the answer is to the query (0-1)"""
@@ -306,8 +577,8 @@ class QueryEvaluator:
             return 0.0
         
         # Simple keyword overlap
-        query_words = set(query.lower().split())
-        answer_words = set(answer.lower().split())
+        query_words = _word_set(query)
+        answer_words = _word_set(answer)
         
         if not query_words:
             return 0.0
@@ -320,8 +591,8 @@ class QueryEvaluator:
         if not answer or not query:
             return {"score": 0.0, "explanation": "Empty query or answer"}
         
-        query_words = set(query.lower().split())
-        answer_words = set(answer.lower().split())
+        query_words = _word_set(query)
+        answer_words = _word_set(answer)
         
         if not query_words:
             return {"score": 0.0, "explanation": "Query has no words"}
@@ -345,8 +616,8 @@ class QueryEvaluator:
             return 0.0
         
         # Simple word overlap
-        expected_words = set(expected.lower().split())
-        actual_words = set(actual.lower().split())
+        expected_words = _word_set(expected)
+        actual_words = _word_set(actual)
         
         if not expected_words:
             return 0.0
@@ -359,8 +630,8 @@ class QueryEvaluator:
         if not expected or not actual:
             return {"score": 0.0, "explanation": "Missing expected or actual answer"}
         
-        expected_words = set(expected.lower().split())
-        actual_words = set(actual.lower().split())
+        expected_words = _word_set(expected)
+        actual_words = _word_set(actual)
         
         if not expected_words:
             return {"score": 0.0, "explanation": "Expected answer has no words"}
@@ -384,8 +655,8 @@ class QueryEvaluator:
             return 0.0
         
         # Check if key information from expected is present
-        expected_key_terms = set(expected.lower().split())
-        actual_terms = set(actual.lower().split())
+        expected_key_terms = _word_set(expected)
+        actual_terms = _word_set(actual)
         
         if not expected_key_terms:
             return 0.0
@@ -398,8 +669,8 @@ class QueryEvaluator:
         if not expected or not actual:
             return {"score": 0.0, "explanation": "Missing expected or actual answer"}
         
-        expected_terms = set(expected.lower().split())
-        actual_terms = set(actual.lower().split())
+        expected_terms = _word_set(expected)
+        actual_terms = _word_set(actual)
         
         if not expected_terms:
             return {"score": 0.0, "explanation": "Expected answer has no terms"}
@@ -423,12 +694,14 @@ class QueryEvaluator:
             return 0.0
         
         # Simple heuristic: check for sentence structure
-        sentences = answer.split('.')
-        if len(sentences) < 2:
+        sentence_count = answer.count('.') + 1
+        if sentence_count < 2:
             return 0.5  # Single sentence, moderate coherence
         
-        # Check average sentence length (coherent answers have reasonable length)
-        avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        # Check average sentence length (coherent answers have reasonable length);
+        # the words of all '.'-separated sentences, counted without splitting
+        # the answer into sentences first
+        avg_length = len(answer.replace('.', ' ').split()) / sentence_count
         
         # Ideal sentence length is 10-20 words
         if 10 <= avg_length <= 20:
@@ -443,8 +716,9 @@ class QueryEvaluator:
         if not answer:
             return {"score": 0.0, "explanation": "Empty answer"}
         
-        sentences = [s.strip() for s in answer.split('.') if s.strip()]
-        sentence_count = len(sentences)
+        # Word count of each non-blank sentence, in one pass
+        sentence_lengths = [length for length in map(len, map(str.split, answer.split('.'))) if length]
+        sentence_count = len(sentence_lengths)
         
         if sentence_count < 2:
             return {
@@ -454,8 +728,7 @@ class QueryEvaluator:
                 "method": "Sentence structure analysis"
             }
         
-        sentence_lengths = [len(s.split()) for s in sentences]
-        avg_length = sum(sentence_lengths) / len(sentence_lengths)
+        avg_length = sum(sentence_lengths) / sentence_count
         
         # Score based on sentence length
         if 10 <= avg_length <= 20:
@@ -484,7 +757,7 @@ class QueryEvaluator:
         
         # Convert context to string
         context_str = str(context).lower()
-        query_words = set(query.lower().split())
+        query_words = _word_set(query)
         
         if not query_words:
             return 0.0
@@ -493,13 +766,18 @@ class QueryEvaluator:
         matches = sum(1 for word in query_words if word in context_str)
         return min(matches / len(query_words), 1.0)
     
-    def _calculate_context_relevance_with_details(self, query: str, context: Any) -> Dict[str, Any]:
-        """Calculate context relevance with detailed breakdown"""
+    def _calculate_context_relevance_with_details(
+        self,
+        query: str,
+        context: Any,
+        context_text: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Calculate context relevance with detailed breakdown (context_text: str(context).lower(), if already computed)"""
         if not context:
             return {"score": 0.0, "explanation": "No context retrieved"}
         
-        context_str = str(context).lower()
-        query_words = set(query.lower().split())
+        context_str = context_text if context_text is not None else str(context).lower()
+        query_words = _word_set(query)
         
         if not query_words:
             return {"score": 0.0, "explanation": "Query has no words"}
@@ -524,7 +802,7 @@ class QueryEvaluator:
             return 0.0
         
         context_str = str(context).lower()
-        answer_words = set(answer.lower().split())
+        answer_words = _word_set(answer)
         
         # Check how many answer words appear in context
         context_words = set(context_str.split())
@@ -535,13 +813,18 @@ class QueryEvaluator:
         
         return min(overlap / len(answer_words), 1.0)
     
-    def _calculate_faithfulness_with_details(self, answer: str, context: Any) -> Dict[str, Any]:
-        """Calculate faithfulness with detailed breakdown"""
+    def _calculate_faithfulness_with_details(
+        self,
+        answer: str,
+        context: Any,
+        context_text: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Calculate faithfulness with detailed breakdown (context_text: str(context).lower(), if already computed)"""
         if not answer or not context:
             return {"score": 0.0, "explanation": "Missing answer or context"}
         
-        context_str = str(context).lower()
-        answer_words = set(answer.lower().split())
+        context_str = context_text if context_text is not None else str(context).lower()
+        answer_words = _word_set(answer)
         context_words = set(context_str.split())
         
         if not answer_words:
@@ -569,11 +852,16 @@ class QueryEvaluator:
         """Calculate answer relevancy with detailed breakdown"""
         return self._calculate_relevance_with_details(query, answer)
     
-    def _summarize_results(self, results: List[QueryEvaluationResult]) -> EvaluationSummary:
+    def _summarize_results(
+        self,
+        results: List[QueryEvaluationResult],
+        wall_time_ms: float = 0.0
+    ) -> EvaluationSummary:
         """Aggregate evaluation results into summary"""
         summary = EvaluationSummary()
         summary.results = results
         summary.total_queries = len(results)
+        summary.wall_time_ms = wall_time_ms
         
         successful = [r for r in results if r.success]
         summary.successful_queries = len(successful)
@@ -582,31 +870,38 @@ class QueryEvaluator:
         if not successful:
             return summary
         
-        # Performance metrics
-        latencies = [r.latency_ms for r in successful]
-        latencies.sort()
-        summary.avg_latency_ms = sum(latencies) / len(latencies)
-        summary.p50_latency_ms = latencies[len(latencies) // 2]
-        summary.p95_latency_ms = latencies[int(len(latencies) * 0.95)]
-        summary.p99_latency_ms = latencies[int(len(latencies) * 0.99)]
+        # One columnar pass over the results; every aggregate below is a
+        # vectorized reduction over these arrays
+        metrics = summary.to_arrays()
         
-        summary.total_tokens = sum(r.tokens_used for r in successful)
-        summary.total_cost_usd = sum(r.cost_usd for r in successful)
+        # Performance metrics
+        latencies = metrics["latency_ms"]
+        count = len(latencies)
+        summary.avg_latency_ms = float(latencies.mean())
+        # Same ranks as indexing the sorted list, selected without a full sort
+        ranks = [count // 2, int(count * 0.95), int(count * 0.99)]
+        selected = np.partition(latencies, ranks)
+        summary.p50_latency_ms, summary.p95_latency_ms, summary.p99_latency_ms = (
+            float(selected[rank]) for rank in ranks
+        )
+        
+        summary.total_tokens = int(metrics["tokens_used"].sum())
+        summary.total_cost_usd = float(metrics["cost_usd"].sum())
         
         # Quality metrics
-        summary.avg_relevance = sum(r.relevance_score for r in successful) / len(successful)
-        summary.avg_accuracy = sum(r.accuracy_score for r in successful if r.accuracy_score > 0) / max(1, sum(1 for r in successful if r.accuracy_score > 0))
-        summary.avg_completeness = sum(r.completeness_score for r in successful if r.completeness_score > 0) / max(1, sum(1 for r in successful if r.completeness_score > 0))
-        summary.avg_coherence = sum(r.coherence_score for r in successful) / len(successful)
+        summary.avg_relevance = float(metrics["relevance_score"].mean())
+        summary.avg_accuracy = _mean_of_scored(metrics["accuracy_score"])
+        summary.avg_completeness = _mean_of_scored(metrics["completeness_score"])
+        summary.avg_coherence = float(metrics["coherence_score"].mean())
         
         # RAG metrics
-        summary.avg_context_relevance = sum(r.context_relevance for r in successful if r.context_relevance > 0) / max(1, sum(1 for r in successful if r.context_relevance > 0))
-        summary.avg_answer_faithfulness = sum(r.answer_faithfulness for r in successful if r.answer_faithfulness > 0) / max(1, sum(1 for r in successful if r.answer_faithfulness > 0))
-        summary.avg_answer_relevancy = sum(r.answer_relevancy for r in successful) / len(successful)
+        summary.avg_context_relevance = _mean_of_scored(metrics["context_relevance"])
+        summary.avg_answer_faithfulness = _mean_of_scored(metrics["answer_faithfulness"])
+        summary.avg_answer_relevancy = float(metrics["answer_relevancy"].mean())
         
         # Cache metrics
-        cache_hits = sum(1 for r in successful if r.cache_hit)
-        summary.cache_hit_rate = cache_hits / len(successful) if successful else 0.0
+        cache_hits = int(metrics["cache_hit"].sum())
+        summary.cache_hit_rate = cache_hits / count
         
         # Error rate
         summary.error_rate = summary.failed_queries / summary.total_queries if summary.total_queries > 0 else 0.0
@@ -614,28 +909,19 @@ class QueryEvaluator:
         return summary
 
 
+# Sample (query, expected answer) pairs, kept immutable and shared
+_SAMPLE_EVALUATION_DATASET = (
+    ("Which AI startups raised funding recently?", "Information about AI startups that received funding"),
+    ("What companies are using OpenAI technology?", "Companies adopting OpenAI's technology"),
+    ("Who are the top investors in the tech industry?", "List of prominent tech investors"),
+    ("Tell me about Anthropic", "Information about Anthropic company"),
+    ("What is the relationship between Sam Altman and OpenAI?", "Sam Altman's role at OpenAI"),
+)
+
+
 def create_sample_evaluation_dataset() -> List[Dict[str, Any]]:
-    """Create a sample dataset for evaluation"""
+    """Create a sample dataset for evaluation (fresh dicts, safe to modify)"""
     return [
-        {
-            "query": "Which AI startups raised funding recently?",
-            "expected_answer": "Information about AI startups that received funding"
-        },
-        {
-            "query": "What companies are using OpenAI technology?",
-            "expected_answer": "Companies adopting OpenAI's technology"
-        },
-        {
-            "query": "Who are the top investors in the tech industry?",
-            "expected_answer": "List of prominent tech investors"
-        },
-        {
-            "query": "Tell me about Anthropic",
-            "expected_answer": "Information about Anthropic company"
-        },
-        {
-            "query": "What is the relationship between Sam Altman and OpenAI?",
-            "expected_answer": "Sam Altman's role at OpenAI"
-        }
+        {"query": query, "expected_answer": expected_answer}
+        for query, expected_answer in _SAMPLE_EVALUATION_DATASET
     ]
-
@@ -4,8 +4,14 @@ Prevents TechCrunch/Disrupt nodes from being created in the graph
 """
 
 import re
+from functools import lru_cache
 from typing import Tuple
 
+# Event context that marks a "Disrupt" name as the TechCrunch conference
+# (a year, "startup", "event", "conference"). A standalone "disrupt"
+# (e.g. "Disrupt Technology") is not filtered.
+_DISRUPT_CONTEXT_RE = re.compile(r"20|STARTUP|EVENT|CONFERENCE")
+
 
 def is_techcrunch_related(name: str) -> bool:
     """
@@ -20,60 +26,25 @@ def is_techcrunch_related(name: str) -> bool:
     if not name:
         return False
 
-    name_upper = name.upper().strip()
+    return _is_techcrunch_name(name)
 
-    # Direct checks for common variations (most reliable)
-    if "TECHCRUNCH" in name_upper and "DISRUPT" in name_upper:
-        return True
 
-    if name_upper == "TECHCRUNCH":
-        return True
+# Entity names recur across articles and relationships; repeats are a
+# cache hit instead of another round of matching
+@lru_cache(maxsize=8192)
+def _is_techcrunch_name(name: str) -> bool:
+    """Match a non-empty entity name against the TechCrunch/Disrupt rules"""
+    name_upper = name.upper().strip()
 
-    # Patterns to match TechCrunch or TechCrunch Disrupt
-    techcrunch_patterns = [
-        r".*TECHCRUNCH.*DISRUPT.*",
-        r".*TECHCRUNCH DISRUPT.*",
-        r"^TECHCRUNCH$",
-        r"^TECHCRUNCH ",
-        r".*TECHCRUNCH.*",
-    ]
+    # Plain substring checks settle almost every name; the regex only runs
+    # to disambiguate names that mention "Disrupt"
+    if "TECHCRUNCH" in name_upper or "BATTLEFIELD" in name_upper:
+        return True
 
-    # Patterns to match TechCrunch Disrupt events/stages
-    disrupt_patterns = [
-        r"^STARTUP BATTLEFIELD.*",
-        r".*BATTLEFIELD.*",
-        r"^DISRUPT.*",
-        r".*DISRUPT.*",
-    ]
+    if "DISRUPT" not in name_upper:
+        return False
 
-    # Check against TechCrunch patterns using search (matches anywhere in string)
-    for pattern in techcrunch_patterns:
-        if re.search(pattern, name_upper):
-            return True
-
-    # Check against Disrupt/Battlefield patterns (TechCrunch Disrupt related)
-    # Only match "DISRUPT" if it's clearly part of a TechCrunch event
-    # Skip standalone "DISRUPT" words that might be legitimate (e.g., "disrupt technology")
-    for pattern in disrupt_patterns:
-        if pattern.startswith("^DISRUPT") or pattern == r".*DISRUPT.*":
-            # For DISRUPT patterns, require additional context (like year, event keywords)
-            if re.search(pattern, name_upper):
-                # Check if it's clearly a TechCrunch Disrupt event (has year, or "TECHCRUNCH" nearby)
-                if any(
-                    keyword in name_upper
-                    for keyword in [
-                        "20",
-                        "BATTLEFIELD",
-                        "STARTUP",
-                        "EVENT",
-                        "CONFERENCE",
-                    ]
-                ):
-                    return True
-        elif re.search(pattern, name_upper):
-            return True
-
-    return False
+    return _DISRUPT_CONTEXT_RE.search(name_upper) is not None
 
 
 def filter_techcrunch_entity(entity: dict) -> Tuple[bool, str]:
@@ -112,15 +83,18 @@ def filter_techcrunch_entities(entities: list) -> Tuple[list, list]:
     Returns:
         (filtered_entities, filtered_names) tuple
     """
-    filtered_entities = []
-    filtered_names = []
-
-    for entity in entities:
-        should_filter, reason = filter_techcrunch_entity(entity)
-        if should_filter:
-            filtered_names.append(entity.get("name", "Unknown"))
-        else:
-            filtered_entities.append(entity)
+    # Same checks as filter_techcrunch_entity, without building a reason
+    # string per filtered entity
+    names = [
+        entity.get("name") if entity and isinstance(entity, dict) else None
+        for entity in entities
+    ]
+    mask = [is_techcrunch_related(name) for name in names]
+
+    filtered_entities = [
+        entity for entity, should_filter in zip(entities, mask) if not should_filter
+    ]
+    filtered_names = [name for name, should_filter in zip(names, mask) if should_filter]
 
     return filtered_entities, filtered_names
 
@@ -12,6 +12,18 @@ from neo4j import GraphDatabase
 # Load environment variables
 load_dotenv()
 
+# Matches TechCrunch Disrupt nodes by their upper-cased name, bound as
+# `upper_name`: "Disrupt" together with "TechCrunch", a year or an event
+# keyword. Plain CONTAINS checks avoid running several regexes per node.
+TECHCRUNCH_DISRUPT_PREDICATE = """
+    upper_name CONTAINS 'DISRUPT'
+    AND (upper_name CONTAINS 'TECHCRUNCH'
+         OR upper_name CONTAINS '20'
+         OR upper_name CONTAINS 'BATTLEFIELD'
+         OR upper_name CONTAINS 'STARTUP'
+         OR upper_name CONTAINS 'EVENT')
+"""
+
 
 class GraphCleaner:
     """Remove MENTIONED_IN relationships and convert to properties"""
@@ -22,9 +34,12 @@ class GraphCleaner:
     def close(self):
         self.driver.close()
 
-    def fix_mentioned_in_relationships(self):
+    def fix_mentioned_in_relationships(self, batch_size: int = 1000):
         """
         Convert MENTIONED_IN relationships to entity properties
+
+        Args:
+            batch_size: Entities migrated per transaction
         """
         print("\n" + "=" * 80)
         print("FIXING MENTIONED_IN RELATIONSHIPS")
@@ -47,26 +62,39 @@ class GraphCleaner:
                 print("No entity types found. Skipping cleanup.")
                 return
 
-            # Step 2: First, migrate ALL MENTIONED_IN relationships to properties (globally)
-            print("Converting all MENTIONED_IN relationships to properties...")
-            session.run(
+            # Step 2: Migrate MENTIONED_IN relationships to properties, one
+            # entity at a time, deleting each entity's relationships in the
+            # same batch so the relationships are only scanned once. Existing
+            # and new article ids are merged with collect(DISTINCT), a hashed
+            # set union, rather than a list membership test per id
+            print("Converting MENTIONED_IN relationships to properties...")
+            migrate_result = session.run(
                 """
-                MATCH (e)-[r:MENTIONED_IN]->(a:Article)
+                MATCH (e)-[:MENTIONED_IN]->(:Article)
                 WHERE NOT e:Article
-                WITH e, collect(DISTINCT a.id) as article_ids
-                SET e.source_articles = CASE 
-                    WHEN e.source_articles IS NULL THEN article_ids
-                    WHEN NOT all(id IN article_ids WHERE id IN e.source_articles) 
-                    THEN e.source_articles + [x IN article_ids WHERE NOT x IN e.source_articles]
-                    ELSE e.source_articles
-                END,
-                e.article_count = size(e.source_articles),
-                e.last_mentioned = timestamp()
-            """
+                WITH DISTINCT e
+                CALL {
+                    WITH e
+                    MATCH (e)-[r:MENTIONED_IN]->(a:Article)
+                    WITH e, collect(DISTINCT a.id) as article_ids, collect(r) as rels
+                    UNWIND coalesce(e.source_articles, []) + article_ids as article_id
+                    WITH e, rels, collect(DISTINCT article_id) as source_articles
+                    SET e.source_articles = source_articles,
+                        e.article_count = size(source_articles),
+                        e.last_mentioned = timestamp()
+                    FOREACH (r IN rels | DELETE r)
+                    RETURN size(rels) as migrated
+                } IN TRANSACTIONS OF $batch_size ROWS
+                RETURN sum(migrated) as deleted
+            """,
+                batch_size=batch_size,
             )
+            migrate_record = migrate_result.single()
+            deleted = migrate_record["deleted"] if migrate_record else 0
             print("✓ Migrated all to properties")
 
-            # Step 3: Delete ALL MENTIONED_IN relationships (regardless of label)
+            # Step 3: Delete any MENTIONED_IN relationships left over (those
+            # not from an entity to an Article)
             print("\nDeleting all MENTIONED_IN relationships...")
             delete_result = session.run(
                 """
@@ -76,7 +104,7 @@ class GraphCleaner:
             """
             )
             delete_record = delete_result.single()
-            deleted = delete_record["deleted"] if delete_record else 0
+            deleted += delete_record["deleted"] if delete_record else 0
             print(f"✓ Deleted {deleted} MENTIONED_IN relationships\n")
 
             # Step 3: Verify cleanup
@@ -109,15 +137,10 @@ class GraphCleaner:
         with self.driver.session() as session:
             # First, find all TechCrunch Disrupt nodes
             result = session.run(
-                """
+                f"""
                 MATCH (n)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR n.name =~ '(?i).*TECHCRUNCH DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*20.*' 
-                            OR n.name =~ '(?i).*BATTLEFIELD.*'
-                            OR n.name =~ '(?i).*STARTUP.*'
-                            OR n.name =~ '(?i).*EVENT.*'))
+                WITH n, toUpper(n.name) AS upper_name
+                WHERE {TECHCRUNCH_DISRUPT_PREDICATE}
                 RETURN labels(n) as type, n.name as name, id(n) as internal_id
                 ORDER BY n.name
             """
@@ -132,52 +155,30 @@ class GraphCleaner:
             for record in nodes_to_delete:
                 print(f"  - {record['name']} ({', '.join(record['type'])})")
 
-            # Delete relationships first
-            print("\nDeleting relationships...")
-            rel_result = session.run(
-                """
-                MATCH (n)-[r]-(related)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR n.name =~ '(?i).*TECHCRUNCH DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*20.*' 
-                            OR n.name =~ '(?i).*BATTLEFIELD.*'
-                            OR n.name =~ '(?i).*STARTUP.*'
-                            OR n.name =~ '(?i).*EVENT.*'))
-                DELETE r
-                RETURN count(r) as deleted
-            """
-            )
-            rel_record = rel_result.single()
-            rel_count = rel_record["deleted"] if rel_record else 0
-            print(f"✓ Deleted {rel_count} relationship(s)")
-
-            # Delete nodes
-            print("\nDeleting nodes...")
-            node_result = session.run(
-                """
+            # Delete nodes together with their relationships
+            print("\nDeleting nodes and relationships...")
+            delete_result = session.run(
+                f"""
                 MATCH (n)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR n.name =~ '(?i).*TECHCRUNCH DISRUPT.*'
-                   OR (n.name =~ '(?i).*DISRUPT.*' 
-                       AND (n.name =~ '(?i).*20.*' 
-                            OR n.name =~ '(?i).*BATTLEFIELD.*'
-                            OR n.name =~ '(?i).*STARTUP.*'
-                            OR n.name =~ '(?i).*EVENT.*'))
-                DELETE n
-                RETURN count(n) as deleted
+                WITH n, toUpper(n.name) AS upper_name
+                WHERE {TECHCRUNCH_DISRUPT_PREDICATE}
+                WITH n, COUNT {{ (n)--() }} AS rel_count
+                DETACH DELETE n
+                RETURN count(n) as nodes, sum(rel_count) as relationships
             """
             )
-            node_record = node_result.single()
-            node_count = node_record["deleted"] if node_record else 0
+            delete_record = delete_result.single()
+            rel_count = delete_record["relationships"] if delete_record else 0
+            node_count = delete_record["nodes"] if delete_record else 0
+            print(f"✓ Deleted {rel_count} relationship(s)")
             print(f"✓ Deleted {node_count} node(s)")
 
             # Verify deletion
             verify_result = session.run(
-                """
+                f"""
                 MATCH (n)
-                WHERE n.name =~ '(?i).*TECHCRUNCH.*DISRUPT.*'
-                   OR n.name =~ '(?i).*TECHCRUNCH DISRUPT.*'
+                WITH n, toUpper(n.name) AS upper_name
+                WHERE {TECHCRUNCH_DISRUPT_PREDICATE}
                 RETURN count(n) as remaining
             """
             )